@@ -1,48 +1,90 @@
+import mmap
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
-def check_and_fix_null_bytes(directory):
-    """检查并修复目录中所有Python文件的空字节"""
+def _scan_one(file_path):
+    """检查并修复单个文件的空字节
+
+    Returns:
+        (是否已修复, 处理时发生的异常)
+    """
+    try:
+        # 空文件无法映射，也不可能包含空字节
+        if os.path.getsize(file_path) == 0:
+            return False, None
+
+        with open(file_path, 'rb') as f:
+            # 通过内存映射检查是否存在空字节，干净文件无需读入内存
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(b'\x00') == -1:
+                    return False, None
+
+                # 直接从映射中取出内容并移除空字节，无需再次读取文件
+                new_content = mm[:].replace(b'\x00', b'')
+
+        # 通过底层文件描述符截断并写回文件
+        fd = os.open(file_path, os.O_WRONLY | os.O_TRUNC | getattr(os, 'O_BINARY', 0))
+        try:
+            view = memoryview(new_content)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+
+        return True, None
+    except Exception as e:
+        return False, e
+
+def check_and_fix_null_bytes(directory, verbose=False):
+    """检查并修复目录中所有Python文件的空字节
+
+    Args:
+        directory: 要检查的目录
+        verbose: 是否在扫描结束后逐个输出已修复的文件
+    """
+    paths = [os.path.join(root, file)
+             for root, dirs, files in os.walk(directory)
+             for file in files if file.endswith('.py')]
+
+    # 扫描以I/O为主，使用线程池并发处理
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(_scan_one, paths))
+
+    # 统一在主线程收集结果，修复的文件由调用方统一输出
     fixed_files = []
-    
-    for root, dirs, files in os.walk(directory):
-        for file in files:
-            if file.endswith('.py'):
-                file_path = os.path.join(root, file)
-                
-                try:
-                    # 读取文件内容
-                    with open(file_path, 'rb') as f:
-                        content = f.read()
-                    
-                    # 检查是否存在空字节
-                    if b'\x00' in content:
-                        # 移除空字节
-                        new_content = content.replace(b'\x00', b'')
-                        
-                        # 写回文件
-                        with open(file_path, 'wb') as f:
-                            f.write(new_content)
-                            
-                        fixed_files.append(file_path)
-                        print(f"已修复文件: {file_path}")
-                except Exception as e:
-                    print(f"处理文件 {file_path} 时出错: {e}")
-    
+    messages = []
+    for file_path, (fixed, error) in zip(paths, results):
+        if error is not None:
+            messages.append(f"处理文件 {file_path} 时出错: {error}\n")
+        elif fixed:
+            fixed_files.append(file_path)
+            if verbose:
+                messages.append(f"已修复文件: {file_path}\n")
+
+    # 一次性写出所有消息
+    if messages:
+        sys.stderr.write(''.join(messages))
+        sys.stderr.flush()
+
     return fixed_files
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        directory = sys.argv[1]
+    args = sys.argv[1:]
+    verbose = '-v' in args
+    args = [arg for arg in args if arg != '-v']
+    if args:
+        directory = args[0]
     else:
         directory = "naruto_battle_system"
-    
+
     print(f"开始检查目录: {directory}")
-    fixed_files = check_and_fix_null_bytes(directory)
-    
+    fixed_files = check_and_fix_null_bytes(directory, verbose)
+
     if fixed_files:
         print(f"已修复 {len(fixed_files)} 个文件:")
         for file in fixed_files:
             print(f"- {file}")
     else:
-        print("未发现包含空字节的文件") 
\ No newline at end of file
+        print("未发现包含空字节的文件")
\ No newline at end of file
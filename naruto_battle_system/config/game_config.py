@@ -1,6 +1,7 @@
 import json
 import os
-from typing import Dict, Any, Optional
+import pickle
+from typing import Dict, Any, Optional, Tuple
 
 
 class GameConfig:
@@ -30,8 +31,17 @@ class GameConfig:
             config_file = os.path.join(os.path.dirname(__file__), 'game_settings.json')
         
         self.config_file = config_file
-        self._config_data = {}
+        self._cache_file = config_file + '.pkl'
+        # 配置在首次访问时才从文件加载
+        self._config_data: Optional[Dict[str, Any]] = None
         
+        self._initialized = True
+    
+    def _ensure_loaded(self) -> None:
+        """确保配置已加载，首次调用时从文件读取"""
+        if self._config_data is not None:
+            return
+            
         # 加载配置
         self.load_config()
         
@@ -39,8 +49,6 @@ class GameConfig:
         if not self._config_data:
             self._set_default_config()
             self.save_config()
-        
-        self._initialized = True
     
     def load_config(self) -> bool:
         """从文件加载配置
@@ -50,8 +58,17 @@ class GameConfig:
         """
         try:
             if os.path.exists(self.config_file):
+                cache_key = self._get_cache_key()
+                
+                # 配置文件未变化时直接使用缓存，跳过JSON解析
+                cached_data = self._load_cache(cache_key)
+                if cached_data is not None:
+                    self._config_data = cached_data
+                    return True
+                
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     self._config_data = json.load(f)
+                self._save_cache(cache_key)
                 return True
         except Exception as e:
             print(f"加载配置文件失败: {str(e)}")
@@ -63,17 +80,69 @@ class GameConfig:
         Returns:
             保存是否成功
         """
+        self._ensure_loaded()
+        
         try:
+            payload = json.dumps(self._config_data, indent=4, ensure_ascii=False).encode('utf-8')
+            
+            # 内容与磁盘上的文件一致时无需重写
+            if os.path.exists(self.config_file):
+                with open(self.config_file, 'rb') as f:
+                    if f.read() == payload:
+                        return True
+            
             # 确保目录存在
             os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
             
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self._config_data, f, indent=4, ensure_ascii=False)
+            with open(self.config_file, 'wb') as f:
+                f.write(payload)
+            
+            # 配置文件已变化，同步刷新缓存
+            self._save_cache(self._get_cache_key())
             return True
         except Exception as e:
             print(f"保存配置文件失败: {str(e)}")
         return False
     
+    def _get_cache_key(self) -> Tuple[int, int]:
+        """获取配置文件的缓存键
+        
+        Returns:
+            配置文件的(修改时间, 文件大小)
+        """
+        stat = os.stat(self.config_file)
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _load_cache(self, cache_key: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+        """从缓存文件加载配置
+        
+        Args:
+            cache_key: 当前配置文件的缓存键
+            
+        Returns:
+            缓存的配置数据，如果缓存不存在或已过期则为None
+        """
+        try:
+            with open(self._cache_file, 'rb') as f:
+                mtime, size, data = pickle.load(f)
+            if (mtime, size) == cache_key:
+                return data
+        except Exception:
+            pass
+        return None
+    
+    def _save_cache(self, cache_key: Tuple[int, int]) -> None:
+        """将配置写入缓存文件，写入失败时忽略
+        
+        Args:
+            cache_key: 当前配置文件的缓存键
+        """
+        try:
+            with open(self._cache_file, 'wb') as f:
+                pickle.dump((cache_key[0], cache_key[1], self._config_data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            pass
+    
     def get(self, key: str, default: Any = None) -> Any:
         """获取配置值
         
@@ -84,6 +153,7 @@ class GameConfig:
         Returns:
             配置值
         """
+        self._ensure_loaded()
         return self._config_data.get(key, default)
     
     def set(self, key: str, value: Any) -> None:
@@ -93,6 +163,7 @@ class GameConfig:
             key: 配置键
             value: 配置值
         """
+        self._ensure_loaded()
         self._config_data[key] = value
     
     def _set_default_config(self) -> None:
@@ -128,6 +199,8 @@ class GameConfig:
             "data": {
                 "save_battle_logs": True,
                 "auto_save": True,
+                "sync_writes": True,  # 保存数据时是否等待写入磁盘，关闭后更快但断电可能丢失数据
+                "bundle_data": False,  # 是否将全部数据合并保存到data/game.bundle，开启后不再使用各存储库的独立数据文件
                 "log_level": "INFO"
             }
         }
@@ -138,6 +211,7 @@ class GameConfig:
         Returns:
             战斗配置字典
         """
+        self._ensure_loaded()
         return self._config_data.get("battle", {})
     
     def get_display_config(self) -> Dict[str, Any]:
@@ -146,6 +220,7 @@ class GameConfig:
         Returns:
             显示配置字典
         """
+        self._ensure_loaded()
         return self._config_data.get("display", {})
     
     def get_data_config(self) -> Dict[str, Any]:
@@ -154,6 +229,7 @@ class GameConfig:
         Returns:
             数据配置字典
         """
+        self._ensure_loaded()
         return self._config_data.get("data", {})
 
 
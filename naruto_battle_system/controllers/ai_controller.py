@@ -1,21 +1,30 @@
 from typing import List, Dict, Optional
+from operator import methodcaller
 import random
 from ..models.character import Character
 from ..models.battle_state import BattleState
 from ..models.action import Action
-from ..models.enums import ActionType, SkillType
+from ..models.enums import ActionType, TargetType
+
+# 技能按威力评分比较时使用的键函数
+_power_rating = methodcaller('get_power_rating')
 
 
 class AIController:
     """AI控制器，用于控制AI角色的战斗决策"""
     
-    def __init__(self, battle_state: BattleState):
+    def __init__(self, battle_state: BattleState, seed: Optional[int] = None):
         """初始化AI控制器
         
         Args:
             battle_state: 战斗状态
+            seed: 随机数种子，用于复现AI对战
         """
         self.battle_state = battle_state
+        # 使用独立的随机数生成器，并缓存其绑定方法以减少属性查找
+        self._rng = random.Random(seed)
+        self._random = self._rng.random
+        self._choice = self._rng.choice
     
     def get_action(self, character: Character) -> Action:
         """获取AI角色的动作
@@ -27,65 +36,82 @@ class AIController:
             生成的动作
         """
         # 判断角色所在队伍
-        own_team = self.battle_state.team_a if character in self.battle_state.team_a.characters else self.battle_state.team_b
-        enemy_team = self.battle_state.team_b if own_team == self.battle_state.team_a else self.battle_state.team_a
-        
-        # 获取敌方存活角色
-        alive_enemies = [c for c in enemy_team.characters if c.is_alive]
-        # 获取友方存活角色
-        alive_allies = [c for c in own_team.characters if c.is_alive and c != character]
+        own_team = self.battle_state.get_character_team(character)
+        enemy_team = self.battle_state.get_opponent_team(own_team)
+        
+        # 一次遍历存活敌人，同时找出血量最低、最高的敌人
+        alive_enemies = enemy_team.alive_characters
+        weakest = strongest = None
+        for c in alive_enemies:
+            if weakest is None:
+                weakest = strongest = c
+            elif c.hp < weakest.hp:
+                weakest = c
+            elif c.hp > strongest.hp:
+                strongest = c
         
         # 如果没有存活的敌人，角色只能跳过回合
         if not alive_enemies:
             return Action(character, ActionType.PASS, None, None)
         
+        # 一次遍历友方，同时获取存活队友和队伍生命值
+        alive_allies = []
+        hp_sum = 0
+        max_hp_sum = 0
+        for c in own_team.alive_characters:
+            hp_sum += c.hp
+            max_hp_sum += c.max_hp
+            if c is not character:
+                alive_allies.append(c)
+        
         # 判断当前状态
-        team_health_percentage = sum(c.hp for c in own_team.characters if c.is_alive) / sum(c.max_hp for c in own_team.characters if c.is_alive)
+        team_health_percentage = hp_sum / max_hp_sum
         
         # 紧急治疗逻辑：如果有队友HP低于20%且自己有治疗技能
         critical_allies = [c for c in alive_allies if c.hp / c.max_hp < 0.2]
-        healing_skills = [s for s in character.skills if s.skill_type == SkillType.HEALING and s.cost <= character.chakra]
+        chakra = character.chakra
+        healing_skills = [s for s in character.get_healing_skills() if s.cost <= chakra]
         
         if critical_allies and healing_skills:
             # 选择HP最低的队友进行治疗
             target = min(critical_allies, key=lambda c: c.hp / c.max_hp)
             # 选择最强的治疗技能
-            skill = max(healing_skills, key=lambda s: s.get_power_rating())
+            skill = max(healing_skills, key=_power_rating)
             return Action(character, ActionType.SKILL, target, skill)
         
         # 群体技能逻辑：如果敌人至少有2个，且有群体攻击技能，则有一定几率使用
-        aoe_skills = [s for s in character.skills if s.target_type.value.startswith("ALL_") and s.cost <= character.chakra]
-        if len(alive_enemies) >= 2 and aoe_skills and random.random() < 0.7:
-            skill = random.choice(aoe_skills)
+        aoe_skills = [s for s in character.get_aoe_skills() if s.cost <= chakra]
+        if len(alive_enemies) >= 2 and aoe_skills and self._random() < 0.7:
+            skill = self._choice(aoe_skills)
             # 群体技能通常不需要选择特定目标
             return Action(character, ActionType.SKILL, alive_enemies[0], skill)
         
         # 增益技能逻辑：当队伍健康状况良好时，有一定几率使用增益技能
         if team_health_percentage > 0.6:
-            buff_skills = [s for s in character.skills if s.skill_type == SkillType.BUFF and s.cost <= character.chakra]
-            if buff_skills and random.random() < 0.4:
-                skill = random.choice(buff_skills)
-                if skill.target_type.name == "SELF":
+            buff_skills = [s for s in character.get_buff_skills() if s.cost <= chakra]
+            if buff_skills and self._random() < 0.4:
+                skill = self._choice(buff_skills)
+                if skill.target_type is TargetType.SELF:
                     return Action(character, ActionType.SKILL, character, skill)
                 else:
                     # 为友方选择一个随机目标
                     targets = alive_allies if alive_allies else [character]
-                    target = random.choice(targets)
+                    target = self._choice(targets)
                     return Action(character, ActionType.SKILL, target, skill)
         
         # 攻击技能逻辑
-        attack_skills = [s for s in character.skills if s.skill_type in [SkillType.DAMAGE, SkillType.DEBUFF] and s.cost <= character.chakra]
+        attack_skills = [s for s in character.get_attack_skills() if s.cost <= chakra]
         
         # 有50%的概率使用攻击技能，如果有的话
-        if attack_skills and random.random() < 0.5:
+        if attack_skills and self._random() < 0.5:
             skill = self._select_best_attack_skill(character, attack_skills, alive_enemies)
             # 选择最佳目标
-            target = self._select_best_target(character, skill, alive_enemies)
+            target = self._select_best_target(character, skill, alive_enemies, weakest, strongest)
             return Action(character, ActionType.SKILL, target, skill)
         
         # 默认使用普通攻击
         # 选择最佳目标
-        target = self._select_attack_target(character, alive_enemies)
+        target = self._select_attack_target(character, alive_enemies, weakest)
         return Action(character, ActionType.ATTACK, target, None)
     
     def _select_best_attack_skill(self, character: Character, skills: List, enemies: List[Character]) -> Optional:
@@ -101,61 +127,63 @@ class AIController:
         """
         # 简单策略：如果敌人很多且有群体技能，优先使用群体技能
         if len(enemies) >= 3:
-            aoe_skills = [s for s in skills if s.target_type.name in ["ALL_ENEMIES", "RANDOM_ENEMIES"]]
+            aoe_skills = [s for s in skills if s.is_aoe()]
             if aoe_skills:
-                return max(aoe_skills, key=lambda s: s.get_power_rating())
+                return max(aoe_skills, key=_power_rating)
         
         # 否则优先选择单体伤害最高的技能
-        single_target_skills = [s for s in skills if s.target_type.name == "SINGLE"]
+        single_target_skills = [s for s in skills if s.target_type is TargetType.SINGLE]
         if single_target_skills:
-            return max(single_target_skills, key=lambda s: s.get_power_rating())
+            return max(single_target_skills, key=_power_rating)
         
         # 如果上述都没有，随机选择一个技能
-        return random.choice(skills)
+        return self._choice(skills)
     
-    def _select_best_target(self, character: Character, skill, enemies: List[Character]) -> Character:
+    def _select_best_target(self, character: Character, skill, enemies: List[Character],
+                            weakest: Character, strongest: Character) -> Character:
         """为技能选择最佳目标
         
         Args:
             character: AI角色
             skill: 要使用的技能
             enemies: 敌人列表
+            weakest: 血量最低的敌人
+            strongest: 血量最高的敌人
             
         Returns:
             选择的目标
         """
-        from ..models.skill import DamageEffect, DebuffEffect
-        
         # 如果是群体技能，目标不重要
-        if skill.target_type.name in ["ALL_ENEMIES", "RANDOM_ENEMIES"]:
+        if skill.is_aoe():
             return enemies[0]
         
-        # 根据技能类型选择不同的目标
-        has_damage = any(isinstance(e, DamageEffect) for e in skill.effects)
-        has_debuff = any(isinstance(e, DebuffEffect) for e in skill.effects)
+        # 根据技能预先计算的效果标志选择不同的目标
+        has_damage = skill.has_damage_effect()
+        has_debuff = skill.has_debuff_effect()
         
         if has_damage and not has_debuff:
             # 纯伤害技能，优先选择血量最低的敌人
-            return min(enemies, key=lambda e: e.hp)
+            return weakest
         elif has_debuff and not has_damage:
             # 纯减益技能，优先选择血量最高的敌人
-            return max(enemies, key=lambda e: e.hp)
+            return strongest
         else:
             # 混合技能，随机选择一个敌人
-            return random.choice(enemies)
+            return self._choice(enemies)
     
-    def _select_attack_target(self, character: Character, enemies: List[Character]) -> Character:
+    def _select_attack_target(self, character: Character, enemies: List[Character], weakest: Character) -> Character:
         """为普通攻击选择最佳目标
         
         Args:
             character: AI角色
             enemies: 敌人列表
+            weakest: 血量最低的敌人
             
         Returns:
             选择的目标
         """
         # 简单策略：80%的几率选择血量最低的敌人，20%的几率随机选择
-        if random.random() < 0.8:
-            return min(enemies, key=lambda e: e.hp)
+        if self._random() < 0.8:
+            return weakest
         else:
-            return random.choice(enemies) 
\ No newline at end of file
+            return self._choice(enemies) 
\ No newline at end of file
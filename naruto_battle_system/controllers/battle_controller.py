@@ -1,18 +1,18 @@
 from typing import List, Dict, Optional, Tuple
 import random
-from ..interfaces.battle_interfaces import IBattleController, IBattleEvents, IAction
+from ..interfaces.battle_interfaces import IBattleEvents, IAction
 from ..models.character import Character
 from ..models.battle_state import BattleState, BattleSession
 from ..models.battle_team import BattleTeam
 from ..models.action import Action, ActionResult
 from ..models.enums import ActionType, TargetType, StatusEffectType
 from ..models.status_effect import StatusEffect
-from ..models.skill import Skill
+from ..models.skill import Skill, DamageEffect, HealingEffect
 from ..utils.logger import game_logger
 
 
-class BattleController(IBattleController):
-    """战斗控制器，实现战斗逻辑"""
+class BattleController:
+    """战斗控制器，实现战斗逻辑（满足IBattleController协议）"""
     
     def __init__(self, battle_state: BattleState, events: IBattleEvents):
         """初始化战斗控制器
@@ -24,6 +24,11 @@ class BattleController(IBattleController):
         self.battle_state = battle_state
         self.events = events
         self._action_queue = []
+        # 事件接收方不需要结果消息时跳过消息记录
+        self._wants_messages = getattr(events, 'wants_messages', True)
+        # 战斗结束判定缓存，以双方存活版本号为键，有角色阵亡或复活时失效
+        self._battle_over_key: Optional[Tuple[int, int]] = None
+        self._battle_over_cache = False
     
     # 实现抽象方法，用于测试
     def start_battle(self, team1: Optional[BattleTeam] = None, team2: Optional[BattleTeam] = None) -> Optional[BattleSession]:
@@ -52,17 +57,17 @@ class BattleController(IBattleController):
         self.battle_state.current_round += 1
         self.battle_state.reset_round_data()
         
-        # 应用回合开始时的效果
-        for team in [self.battle_state.team_a, self.battle_state.team_b]:
-            for character in team.characters:
-                if not character.is_alive:
-                    continue
-                    
-                # 回复查克拉
-                character.chakra = min(character.chakra + character.chakra_regen, character.max_chakra)
-                
-                # 处理状态效果
-                self._process_turn_based_effects(character)
+        # 应用回合开始时的效果，直接遍历缓存的存活角色列表
+        for character in self.battle_state.get_alive_characters():
+            # 列表在遍历开始时取得，期间阵亡的角色不再结算
+            if not character.is_alive:
+                continue
+            
+            # 回复查克拉
+            character.chakra = min(character.chakra + character.chakra_regen, character.max_chakra)
+            
+            # 处理状态效果
+            self._process_turn_based_effects(character)
         
         self.events.on_round_start(self.battle_state)
         
@@ -80,9 +85,8 @@ class BattleController(IBattleController):
                     game_logger.debug(f"_calculate_turn_order: Adding character to all_characters: ID={character.id}, Name={character.name}, Speed={character.speed}, Alive={character.is_alive}")
                     all_characters.append(character)
         
-        # 根据速度和随机因素排序
-        random.shuffle(all_characters)  # 先随机打乱以处理速度相同的情况
-        all_characters.sort(key=lambda c: c.speed, reverse=True)
+        # 根据速度排序，速度相同时以随机键决定先后
+        all_characters.sort(key=lambda c: (-c.speed, random.random()))
         
         self.battle_state.turn_order = all_characters
         self.battle_state.current_character_index = 0
@@ -99,7 +103,10 @@ class BattleController(IBattleController):
         Args:
             character: 需要处理状态效果的角色
         """
-        effects_to_remove = []
+        # 一次遍历完成效果结算，并收集过期的效果
+        expired_effects = []
+        hp = character.hp
+        max_hp = character.max_hp
         
         for effect in character.status_effects:
             # 减少持续时间
@@ -107,53 +114,60 @@ class BattleController(IBattleController):
                 effect.duration -= 1
             
             # 应用效果
-            if effect.effect_type == StatusEffectType.DOT:
+            effect_type = effect.effect_type
+            if effect_type is StatusEffectType.DOT:
                 damage = effect.value
-                character.hp = max(0, character.hp - damage)
+                hp = max(0, hp - damage)
+                character.hp = hp
                 self.events.on_effect_triggered(character, effect, damage)
                 
-            elif effect.effect_type == StatusEffectType.HOT:
+            elif effect_type is StatusEffectType.HOT:
                 healing = effect.value
-                character.hp = min(character.max_hp, character.hp + healing)
+                hp = min(max_hp, hp + healing)
+                character.hp = hp
                 self.events.on_effect_triggered(character, effect, healing)
             
-            # 标记已过期的效果
             if effect.duration == 0:
-                effects_to_remove.append(effect)
+                expired_effects.append(effect)
         
-        # 移除过期的效果
-        for effect in effects_to_remove:
-            character.status_effects.remove(effect)
+        # 持续时间已变化，状态显示需要重新格式化
+        character.invalidate_status()
+        
+        # 移除过期的效果，移除完成后再通知
+        character.remove_status_effects(expired_effects)
+        for effect in expired_effects:
             self.events.on_status_effect_removed(character, effect)
     
     def process_turn(self) -> bool:
         """处理当前角色的回合，返回战斗是否结束"""
-        game_logger.debug(f"process_turn: Entry. Round: {self.battle_state.current_round}, Char Index: {self.battle_state.current_character_index}, Turn Order: {[(c.id, c.name) for c in self.battle_state.turn_order]}")
-        if self.is_battle_over():
-            self.events.on_battle_end(self.battle_state)
-            return True
-            
-        game_logger.debug("process_turn: About to get current character.")
-        current_character = self.get_current_character()
-        if not current_character:
-            game_logger.debug("process_turn: current_character is None. Preparing new round.")
-            self._prepare_new_round()
-            return self.process_turn()
-        
-        # 如果角色无法行动（如被眩晕），跳过回合
-        if self._is_character_disabled(current_character):
-            self.events.on_turn_skipped(current_character)
-            return self.next_turn()
-            
-        # 如果是AI控制的角色，生成AI动作
-        if not current_character.is_player_controlled:
-            game_logger.debug(f"process_turn: Current character {current_character.name} (ID: {current_character.id}) is AI controlled. Generating AI action.")
-            action = self._generate_ai_action(current_character)
-            game_logger.debug(f"process_turn: AI action generated: {action.action_type} by {action.character.name} on {action.target.name if action.target else 'None'} with skill {action.skill.name if action.skill else 'None'}")
-            return self.execute_action(action)
+        # 新回合准备完成后在循环内重新处理，避免递归调用
+        while True:
+            game_logger.debug(f"process_turn: Entry. Round: {self.battle_state.current_round}, Char Index: {self.battle_state.current_character_index}, Turn Order: {[(c.id, c.name) for c in self.battle_state.turn_order]}")
+            if self.is_battle_over():
+                self.events.on_battle_end(self.battle_state)
+                return True
+                
+            game_logger.debug("process_turn: About to get current character.")
+            current_character = self.get_current_character()
+            if not current_character:
+                game_logger.debug("process_turn: current_character is None. Preparing new round.")
+                self._prepare_new_round()
+                continue
             
-        # 等待玩家输入，此时不推进回合
-        return False
+            # 如果角色无法行动（如被眩晕），跳过回合
+            if self._is_character_disabled(current_character):
+                self.events.on_turn_skipped(current_character)
+                return self.next_turn()
+                
+            # 如果是AI控制的角色，生成AI动作
+            if not current_character.is_player_controlled:
+                game_logger.debug(f"process_turn: Current character {current_character.name} (ID: {current_character.id}) is AI controlled. Generating AI action.")
+                action = self._generate_ai_action(current_character)
+                game_logger.debug(f"process_turn: AI action generated: {action.action_type.name} by {action.character.name} on {action.target.name if action.target else 'None'} with skill {action.skill.name if action.skill else 'None'}")
+                return self.execute_action(action)
+                
+            # 等待玩家输入，此时不推进回合
+            return False
     
     def _is_character_disabled(self, character: Character) -> bool:
         """判断角色是否无法行动
@@ -164,10 +178,8 @@ class BattleController(IBattleController):
         Returns:
             如果角色无法行动返回True
         """
-        for effect in character.status_effects:
-            if effect.effect_type in [StatusEffectType.STUN, StatusEffectType.FREEZE]:
-                return True
-        return False
+        # 眩晕/冰冻数量由角色在状态效果变化时维护
+        return character.is_disabled()
     
     def _generate_ai_action(self, character: Character) -> Action:
         """为AI角色生成动作
@@ -179,12 +191,12 @@ class BattleController(IBattleController):
             生成的动作
         """
         # 简单的AI逻辑：优先使用技能，如果没有可用的技能则普通攻击
-        enemy_team = self.battle_state.team_a if character in self.battle_state.team_b.characters else self.battle_state.team_b
+        enemy_team = self.battle_state.get_opponent_team(self.battle_state.get_character_team(character))
         
         # 查找敌人中HP最低的作为目标
-        targets = [c for c in enemy_team.characters if c.is_alive]
+        targets = enemy_team.alive_characters
         if not targets:
-            return Action(character, ActionType.PASS, None, None)
+            return Action(character, ActionType.PASS, None, None, enemy_team)
             
         target = min(targets, key=lambda c: c.hp)
         
@@ -192,10 +204,10 @@ class BattleController(IBattleController):
         available_skills = [skill for skill in character.skills if skill.cost <= character.chakra]
         if available_skills:
             skill = random.choice(available_skills)
-            return Action(character, ActionType.SKILL, target, skill)
+            return Action(character, ActionType.SKILL, target, skill, enemy_team)
         
         # 如果没有可用技能，使用普通攻击
-        return Action(character, ActionType.ATTACK, target, None)
+        return Action(character, ActionType.ATTACK, target, None, enemy_team)
     
     def execute_action(self, action: Action) -> bool:
         """执行动作
@@ -206,34 +218,32 @@ class BattleController(IBattleController):
         Returns:
             战斗是否结束
         """
-        game_logger.debug(f"execute_action: Called with action: {action.action_type} by {action.character.name} (ID: {action.character.id}) on {action.target.name if action.target else 'None'} (ID: {action.target.id if action.target else 'None'}) with skill {action.skill.name if action.skill else 'None'}")
-        result = ActionResult(action)
-        
-        if action.action_type == ActionType.ATTACK:
-            self._execute_attack(action, result)
-        elif action.action_type == ActionType.SKILL:
-            self._execute_skill(action, result)
-        elif action.action_type == ActionType.ITEM:
-            self._execute_item(action, result)
-        elif action.action_type == ActionType.PASS:
-            result.success = True
+        # 以循环代替递归处理连击队列，调用栈深度保持不变
+        while True:
+            game_logger.debug(f"execute_action: Called with action: {action.action_type.name} by {action.character.name} (ID: {action.character.id}) on {action.target.name if action.target else 'None'} (ID: {action.target.id if action.target else 'None'}) with skill {action.skill.name if action.skill else 'None'}")
+            result = ActionResult(action, record_messages=self._wants_messages)
             
-        # 触发动作完成事件
-        self.events.on_action_executed(result)
-        
-        # 检查任何一方是否全部阵亡
-        if self.is_battle_over():
-            self.events.on_battle_end(self.battle_state)
-            return True
+            # 按动作类型的整数值查表分派，跳过回合等无需处理的类型对应None
+            handler = _ACTION_HANDLERS[action.action_type]
+            if handler is not None:
+                handler(self, action, result)
+                
+            # 触发动作完成事件
+            self.events.on_action_executed(result)
             
-        # 添加可能的连击动作到队列
-        self._process_combo_actions(action, result)
-        
-        # 如果有连击队列，处理连击
-        if self._action_queue:
-            next_action = self._action_queue.pop(0)
-            return self.execute_action(next_action)
+            # 检查任何一方是否全部阵亡
+            if self.is_battle_over():
+                self.events.on_battle_end(self.battle_state)
+                return True
+                
+            # 添加可能的连击动作到队列
+            self._process_combo_actions(action, result)
             
+            # 如果有连击队列，继续处理下一个连击动作
+            if not self._action_queue:
+                break
+            action = self._action_queue.pop(0)
+                
         # 进入下一个角色的回合
         return self.next_turn()
     
@@ -249,23 +259,24 @@ class BattleController(IBattleController):
         
         if not target or not target.is_alive:
             result.success = False
-            result.add_message(f"{attacker.name}的攻击没有有效目标")
+            result.add_message("{}的攻击没有有效目标", attacker.name)
             return
             
-        # 计算伤害
-        base_damage = attacker.attack - target.defense // 2
-        damage = max(1, base_damage)  # 至少造成1点伤害
+        # 计算伤害，至少造成1点伤害（标量运算直接比较，避免调用max）
+        damage = attacker.attack - target.defense // 2
+        if damage < 1:
+            damage = 1
         
         # 应用伤害
         actual_damage = target.take_damage(damage)
         
         # 记录结果
         result.success = True
-        result.add_message(f"{attacker.name}攻击了{target.name}，造成了{actual_damage}点伤害")
+        result.add_message("{}攻击了{}，造成了{}点伤害", attacker.name, target.name, actual_damage)
         
         # 检查目标是否死亡
         if not target.is_alive:
-            result.add_message(f"{target.name}被击败了")
+            result.add_message("{}被击败了", target.name)
     
     def _execute_skill(self, action: Action, result: ActionResult) -> None:
         """执行技能动作
@@ -280,18 +291,21 @@ class BattleController(IBattleController):
         
         if not skill:
             result.success = False
-            result.add_message(f"{caster.name}尝试使用技能，但没有指定技能")
+            result.add_message("{}尝试使用技能，但没有指定技能", caster.name)
             return
             
         if not target or not target.is_alive:
             result.success = False
-            result.add_message(f"{caster.name}的{skill.name}没有有效目标")
+            result.add_message("{}的{}没有有效目标", caster.name, skill.name)
             return
             
         # 消耗查克拉 (优先使用skill.cost，兼容测试)
-        cost = skill.cost if hasattr(skill, 'cost') and skill.cost > 0 else skill.chakra_cost
+        cost = skill.cost
+        if cost <= 0:
+            cost = skill.chakra_cost
         if cost > 0:
-            caster.chakra = max(0, caster.chakra - cost)
+            chakra = caster.chakra - cost
+            caster.chakra = chakra if chakra > 0 else 0
             
         # 应用技能效果
         for effect in skill.effects:
@@ -299,7 +313,7 @@ class BattleController(IBattleController):
             
         # 记录结果
         result.success = True
-        result.add_message(f"{caster.name}对{target.name}使用了{skill.name}")
+        result.add_message("{}对{}使用了{}", caster.name, target.name, skill.name)
     
     def _execute_item(self, action: Action, result: ActionResult) -> None:
         """执行道具使用
@@ -310,7 +324,7 @@ class BattleController(IBattleController):
         """
         # 道具系统尚未实现
         result.success = False
-        result.message = "道具系统尚未实现"
+        result.add_message("道具系统尚未实现")
     
     def _get_skill_targets(self, action: Action) -> List[Character]:
         """获取技能的目标列表
@@ -324,9 +338,11 @@ class BattleController(IBattleController):
         skill = action.skill
         character = action.character
         
-        # 确定角色所在队伍和敌对队伍
-        own_team = self.battle_state.team_a if character in self.battle_state.team_a.characters else self.battle_state.team_b
-        enemy_team = self.battle_state.team_b if own_team == self.battle_state.team_a else self.battle_state.team_a
+        # 确定角色所在队伍和敌对队伍，敌方队伍缓存在动作上
+        own_team = self.battle_state.get_character_team(character)
+        if action.enemy_team is None:
+            action.enemy_team = self.battle_state.get_opponent_team(own_team)
+        enemy_team = action.enemy_team
         
         targets = []
         
@@ -335,16 +351,17 @@ class BattleController(IBattleController):
                 targets = [action.target]
                 
         elif skill.target_type == TargetType.ALL_ALLIES:
-            targets = [c for c in own_team.characters if c.is_alive]
+            # 复制存活列表，结算过程中角色阵亡不影响本次目标
+            targets = list(own_team.alive_characters)
             
         elif skill.target_type == TargetType.ALL_ENEMIES:
-            targets = [c for c in enemy_team.characters if c.is_alive]
+            targets = list(enemy_team.alive_characters)
             
         elif skill.target_type == TargetType.SELF:
             targets = [character]
             
-        elif skill.target_type == TargetType.RANDOM_ENEMY:
-            alive_enemies = [c for c in enemy_team.characters if c.is_alive]
+        elif skill.target_type == TargetType.RANDOM_N_ENEMIES:
+            alive_enemies = enemy_team.alive_characters
             if alive_enemies:
                 targets = [random.choice(alive_enemies)]
         
@@ -359,31 +376,50 @@ class BattleController(IBattleController):
             effect: 效果
             result: 动作结果
         """
-        from ..models.skill import DamageEffect, HealingEffect
+        # 按效果的具体类型查表分派，避免逐个isinstance判断
+        handler = _EFFECT_HANDLERS.get(type(effect))
+        if handler is not None:
+            handler(self, caster, target, effect, result)
+    
+    def _apply_damage_effect(self, caster: Character, target: Character, effect: DamageEffect, result: ActionResult) -> None:
+        """应用伤害效果
         
-        if isinstance(effect, DamageEffect):
-            # 计算伤害
-            damage = effect.calculate_damage(caster.attack)
-            
-            # 应用伤害
-            actual_damage = target.take_damage(damage)
-            
-            # 记录结果
-            result.add_message(f"{caster.name}的技能对{target.name}造成了{actual_damage}点伤害")
-            
-            # 检查目标是否死亡
-            if not target.is_alive:
-                result.add_message(f"{target.name}被击败了")
-                
-        elif isinstance(effect, HealingEffect):
-            # 计算治疗量
-            healing = effect.calculate_healing(caster.attack)
-            
-            # 应用治疗
-            actual_healing = target.heal(healing)
-            
-            # 记录结果
-            result.add_message(f"{caster.name}的技能为{target.name}恢复了{actual_healing}点生命值")
+        Args:
+            caster: 施法者
+            target: 目标
+            effect: 伤害效果
+            result: 动作结果
+        """
+        # 计算伤害
+        damage = effect.calculate_damage(caster.attack)
+        
+        # 应用伤害
+        actual_damage = target.take_damage(damage)
+        
+        # 记录结果
+        result.add_message("{}的技能对{}造成了{}点伤害", caster.name, target.name, actual_damage)
+        
+        # 检查目标是否死亡
+        if not target.is_alive:
+            result.add_message("{}被击败了", target.name)
+    
+    def _apply_healing_effect(self, caster: Character, target: Character, effect: HealingEffect, result: ActionResult) -> None:
+        """应用治疗效果
+        
+        Args:
+            caster: 施法者
+            target: 目标
+            effect: 治疗效果
+            result: 动作结果
+        """
+        # 计算治疗量
+        healing = effect.calculate_healing(caster.attack)
+        
+        # 应用治疗
+        actual_healing = target.heal(healing)
+        
+        # 记录结果
+        result.add_message("{}的技能为{}恢复了{}点生命值", caster.name, target.name, actual_healing)
     
     def _process_combo_actions(self, action: Action, result: ActionResult) -> None:
         """处理连击动作
@@ -431,27 +467,43 @@ class BattleController(IBattleController):
     
     def is_battle_over(self) -> bool:
         """判断战斗是否结束"""
-        game_logger.debug("is_battle_over: Checking Team A characters:")
-        for char_a in self.battle_state.team_a.characters:
-            game_logger.debug(f"is_battle_over: Team A Char: ID={char_a.id}, Name={char_a.name}, HP={char_a.hp}, Alive={char_a.is_alive}")
-
-        game_logger.debug("is_battle_over: Checking Team B characters:")
-        for char_b in self.battle_state.team_b.characters:
-            game_logger.debug(f"is_battle_over: Team B Char: ID={char_b.id}, Name={char_b.name}, HP={char_b.hp}, Alive={char_b.is_alive}")
-
-        team_a_alive = any(c.is_alive for c in self.battle_state.team_a.characters)
-        team_b_alive = any(c.is_alive for c in self.battle_state.team_b.characters)
-        
-        game_logger.debug(f"is_battle_over: Team A Alive: {team_a_alive}, Team B Alive: {team_b_alive}, Battle Over: {not (team_a_alive and team_b_alive)}")
-        return not (team_a_alive and team_b_alive)
+        team_a = self.battle_state.team_a
+        team_b = self.battle_state.team_b
+        
+        # 自上次判定以来没有角色阵亡或复活时直接返回缓存结果
+        key = (team_a.alive_version, team_b.alive_version)
+        if key == self._battle_over_key:
+            return self._battle_over_cache
+        
+        # 直接使用队伍维护的存活计数，无需遍历角色
+        team_a_alive = team_a.alive_count
+        team_b_alive = team_b.alive_count
+        self._battle_over_cache = team_a_alive == 0 or team_b_alive == 0
+        self._battle_over_key = key
+        
+        game_logger.debug(f"is_battle_over: Team A Alive: {team_a_alive}, Team B Alive: {team_b_alive}, Battle Over: {self._battle_over_cache}")
+        return self._battle_over_cache
     
     def get_winning_team(self) -> Optional[BattleTeam]:
         """获取获胜的队伍，如果战斗未结束返回None"""
         if not self.is_battle_over():
             return None
             
-        team_a_alive = any(c.is_alive for c in self.battle_state.team_a.characters)
-        if team_a_alive:
+        if self.battle_state.team_a.alive_count > 0:
             return self.battle_state.team_a
         else:
-            return self.battle_state.team_b 
\ No newline at end of file
+            return self.battle_state.team_b
+
+
+# 动作类型到处理方法的分派表，以ActionType的整数值为下标，新增动作类型时在此登记
+_ACTION_HANDLERS = tuple({
+    ActionType.ATTACK: BattleController._execute_attack,
+    ActionType.SKILL: BattleController._execute_skill,
+    ActionType.ITEM: BattleController._execute_item,
+}.get(value) for value in range(max(ActionType) + 1))
+
+# 技能效果类型到处理方法的分派表，新增效果类型时在此登记
+_EFFECT_HANDLERS = {
+    DamageEffect: BattleController._apply_damage_effect,
+    HealingEffect: BattleController._apply_healing_effect,
+}
\ No newline at end of file
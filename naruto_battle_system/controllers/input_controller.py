@@ -1,7 +1,8 @@
+import sys
 from typing import List, Dict, Optional, Callable, Any, TYPE_CHECKING
 from ..models.character import Character
 from ..models.action import Action
-from ..models.enums import ActionType
+from ..models.enums import ActionType, TargetType
 from ..models.skill import Skill
 from ..models.common_types import CharacterProtocol
 
@@ -9,6 +10,57 @@ from ..models.common_types import CharacterProtocol
 if TYPE_CHECKING:
     from ..models.battle_state import BattleState
 
+# 帮助信息，预先拼接好以便一次输出
+_HELP_TEXT = (
+    "可用命令:\n"
+    "  attack/a [目标ID] - 对指定目标进行普通攻击\n"
+    "  skill/s [技能ID] [目标ID] - 使用指定技能攻击指定目标\n"
+    "  item/i [道具ID] [目标ID] - 使用指定道具（尚未实现）\n"
+    "  pass/p - 跳过当前回合\n"
+    "  status/st - 显示战斗状态\n"
+    "  help/h - 显示此帮助信息\n"
+)
+
+# 命令关键字及别名对应的处理方法名
+_COMMAND_HANDLERS: Dict[str, str] = {
+    "attack": "_handle_attack_command",
+    "a": "_handle_attack_command",
+    "skill": "_handle_skill_command",
+    "s": "_handle_skill_command",
+    "item": "_handle_item_command",
+    "i": "_handle_item_command",
+    "pass": "_handle_pass_command",
+    "p": "_handle_pass_command",
+    "help": "_handle_help_command",
+    "h": "_handle_help_command",
+    "status": "_handle_status_command",
+    "st": "_handle_status_command",
+}
+
+def _noop_callback(action: Action) -> None:
+    """未注册动作回调时使用的空操作"""
+
+
+def _parse_1based_index(text: str, upper: int) -> int:
+    """将玩家输入的1起始序号解析为0起始索引
+    
+    Args:
+        text: 输入的序号文本
+        upper: 有效索引的上限（不含）
+        
+    Returns:
+        0起始索引，无效输入或越界时返回-1
+    """
+    # isdecimal与int()接受的数字字符一致（包括全角数字），避免int()失败时抛出异常的开销
+    if not text.isdecimal():
+        return -1
+    index = int(text) - 1
+    return index if 0 <= index < upper else -1
+
+
+# 不需要手动指定目标的技能目标类型
+_GROUP_TARGETS = frozenset({TargetType.ALL_ALLIES, TargetType.ALL_ENEMIES, TargetType.RANDOM_N_ENEMIES})
+
 
 class InputController:
     """输入控制器，处理玩家输入"""
@@ -21,6 +73,22 @@ class InputController:
         """
         self.battle_state = battle_state
         self.on_action_selected_callback: Optional[Callable[[Action], None]] = None
+        # 实际调用的通知函数，未注册回调时为空操作，省去每次的判断
+        self._notify: Callable[[Action], None] = _noop_callback
+        
+        # 命令关键字及别名到处理方法的分派表
+        self._dispatch: Dict[str, Callable[[List[str], Character], bool]] = {
+            keyword: getattr(self, handler_name) for keyword, handler_name in _COMMAND_HANDLERS.items()
+        }
+        
+        # 技能目标类型到目标解析方法的分派表
+        self._target_resolvers: Dict[TargetType, Callable[..., Optional[Character]]] = {
+            TargetType.SELF: self._resolve_self_target,
+            TargetType.SINGLE: self._resolve_enemy_target,
+            TargetType.SINGLE_ALLY: self._resolve_ally_target,
+        }
+        for group_target in _GROUP_TARGETS:
+            self._target_resolvers[group_target] = self._resolve_group_target
         
     def register_action_callback(self, callback: Callable[[Action], None]) -> None:
         """注册动作选择回调函数
@@ -29,6 +97,7 @@ class InputController:
             callback: 当玩家选择动作时调用的函数
         """
         self.on_action_selected_callback = callback
+        self._notify = callback if callback else _noop_callback
         
     def process_command(self, command: str, character: Character) -> bool:
         """处理玩家输入的命令
@@ -40,31 +109,22 @@ class InputController:
         Returns:
             如果命令有效并已处理返回True，否则返回False
         """
-        # 分割命令和参数
-        parts = command.strip().split()
+        # 分割命令和参数，split()本身会忽略首尾空白
+        parts = command.split()
         if not parts:
             return False
             
-        command_type = parts[0].lower()
-        
-        # 处理不同类型的命令
-        if command_type == "attack" or command_type == "a":
-            return self._handle_attack_command(parts, character)
-        elif command_type == "skill" or command_type == "s":
-            return self._handle_skill_command(parts, character)
-        elif command_type == "item" or command_type == "i":
-            return self._handle_item_command(parts, character)
-        elif command_type == "pass" or command_type == "p":
-            return self._handle_pass_command(character)
-        elif command_type == "help" or command_type == "h":
-            self._show_help()
-            return False
-        elif command_type == "status" or command_type == "st":
-            self._show_battle_status()
-            return False
-        else:
-            print(f"未知命令: {command_type}。输入 'help' 查看可用命令。")
-            return False
+        command_type = parts[0]
+        
+        # 通过分派表查找命令处理方法，仅在未命中时才转为小写重试
+        handler = self._dispatch.get(command_type)
+        if handler is None:
+            command_type = command_type.lower()
+            handler = self._dispatch.get(command_type)
+            if handler is None:
+                print(f"未知命令: {command_type}。输入 'help' 查看可用命令。")
+                return False
+        return handler(parts, character)
     
     def _handle_attack_command(self, parts: List[str], character: Character) -> bool:
         """处理攻击命令
@@ -77,32 +137,29 @@ class InputController:
             如果命令处理成功返回True
         """
         # 判断角色所在队伍
-        own_team = self.battle_state.team_a if character in self.battle_state.team_a.characters else self.battle_state.team_b
-        enemy_team = self.battle_state.team_b if own_team == self.battle_state.team_a else self.battle_state.team_a
+        battle_state = self.battle_state
+        own_team = battle_state.get_character_team(character)
+        enemy_team = battle_state.get_opponent_team(own_team)
         
         # 获取敌方存活角色
-        alive_enemies = [c for c in enemy_team.characters if c.is_alive]
+        alive_enemies = enemy_team.alive_characters
         
         if not alive_enemies:
             print("没有可攻击的目标！")
             return False
         
         target_idx = 0
+        enemy_count = len(alive_enemies)
         # 如果指定了目标索引
         if len(parts) > 1:
-            try:
-                target_idx = int(parts[1]) - 1  # 转为0-based索引
-                if target_idx < 0 or target_idx >= len(alive_enemies):
-                    print(f"无效的目标索引: {target_idx + 1}")
-                    self._show_enemy_targets(alive_enemies)
-                    return False
-            except ValueError:
+            target_idx = _parse_1based_index(parts[1], enemy_count)
+            if target_idx < 0:
                 print(f"无效的目标索引: {parts[1]}")
                 self._show_enemy_targets(alive_enemies)
                 return False
         else:
             # 如果没有指定目标，显示可用目标
-            if len(alive_enemies) > 1:
+            if enemy_count > 1:
                 self._show_enemy_targets(alive_enemies)
                 return False
         
@@ -112,8 +169,7 @@ class InputController:
         action = Action(character, ActionType.ATTACK, target, None)
         
         # 通知回调
-        if self.on_action_selected_callback:
-            self.on_action_selected_callback(action)
+        self._notify(action)
         
         return True
     
@@ -140,13 +196,8 @@ class InputController:
             return False
         
         # 解析技能索引
-        try:
-            skill_idx = int(parts[1]) - 1  # 转为0-based索引
-            if skill_idx < 0 or skill_idx >= len(skills):
-                print(f"无效的技能索引: {skill_idx + 1}")
-                self._show_character_skills(character)
-                return False
-        except ValueError:
+        skill_idx = _parse_1based_index(parts[1], len(skills))
+        if skill_idx < 0:
             print(f"无效的技能索引: {parts[1]}")
             self._show_character_skills(character)
             return False
@@ -154,97 +205,107 @@ class InputController:
         skill = skills[skill_idx]
         
         # 检查查克拉是否足够
-        if character.chakra < skill.cost:
-            print(f"查克拉不足！{skill.name}需要{skill.cost}点查克拉，但{character.name}只有{character.chakra}点。")
+        chakra = character.chakra
+        cost = skill.cost
+        if chakra < cost:
+            print(f"查克拉不足！{skill.name}需要{cost}点查克拉，但{character.name}只有{chakra}点。")
             return False
         
         # 判断目标类型
         target_type = skill.target_type
         
         # 判断角色所在队伍
-        own_team = self.battle_state.team_a if character in self.battle_state.team_a.characters else self.battle_state.team_b
-        enemy_team = self.battle_state.team_b if own_team == self.battle_state.team_a else self.battle_state.team_a
-        
-        # 根据技能目标类型确定可选目标
-        if target_type.name == "SELF":
-            target = character
-        elif target_type.name == "SINGLE":
-            # 获取敌方存活角色
-            alive_enemies = [c for c in enemy_team.characters if c.is_alive]
-            
-            if not alive_enemies:
-                print("没有可攻击的目标！")
-                return False
-            
-            # 如果没有指定目标或目标无效
-            if len(parts) <= 2:
-                self._show_enemy_targets(alive_enemies)
-                print(f"请为{skill.name}技能选择一个目标: skill {skill_idx + 1} <目标ID>")
-                return False
-            
-            try:
-                target_idx = int(parts[2]) - 1  # 转为0-based索引
-                if target_idx < 0 or target_idx >= len(alive_enemies):
-                    print(f"无效的目标索引: {target_idx + 1}")
-                    self._show_enemy_targets(alive_enemies)
-                    return False
-                
-                target = alive_enemies[target_idx]
-            except ValueError:
-                print(f"无效的目标索引: {parts[2]}")
-                self._show_enemy_targets(alive_enemies)
-                return False
-        elif target_type.name == "ALLY":
-            # 获取友方存活角色
-            alive_allies = [c for c in own_team.characters if c.is_alive]
-            
-            if not alive_allies:
-                print("没有可选择的友方目标！")
-                return False
-            
-            # 如果没有指定目标或目标无效
-            if len(parts) <= 2:
-                self._show_ally_targets(alive_allies)
-                print(f"请为{skill.name}技能选择一个友方目标: skill {skill_idx + 1} <目标ID>")
-                return False
-            
-            try:
-                target_idx = int(parts[2]) - 1  # 转为0-based索引
-                if target_idx < 0 or target_idx >= len(alive_allies):
-                    print(f"无效的目标索引: {target_idx + 1}")
-                    self._show_ally_targets(alive_allies)
-                    return False
-                
-                target = alive_allies[target_idx]
-            except ValueError:
-                print(f"无效的目标索引: {parts[2]}")
-                self._show_ally_targets(alive_allies)
-                return False
-        elif target_type.name in ["ALL_ALLIES", "ALL_ENEMIES", "RANDOM_ENEMY"]:
-            # 群体技能或随机目标技能不需要指定目标
-            if target_type.name == "ALL_ALLIES":
-                # 随便选一个友方角色作为名义上的目标
-                target = character
-            else:
-                # 随便选一个敌人作为名义上的目标
-                alive_enemies = [c for c in enemy_team.characters if c.is_alive]
-                if not alive_enemies:
-                    print("没有可攻击的目标！")
-                    return False
-                target = alive_enemies[0]
-        else:
-            print(f"未知的技能目标类型: {target_type}")
+        battle_state = self.battle_state
+        own_team = battle_state.get_character_team(character)
+        enemy_team = battle_state.get_opponent_team(own_team)
+        
+        # 根据技能目标类型查表解析目标
+        resolver = self._target_resolvers.get(target_type)
+        if resolver is None:
+            print(f"未知的技能目标类型: {target_type.name}")
+            return False
+        
+        target = resolver(parts, character, skill, skill_idx, own_team, enemy_team)
+        if target is None:
             return False
         
         # 创建技能动作
         action = Action(character, ActionType.SKILL, target, skill)
         
         # 通知回调
-        if self.on_action_selected_callback:
-            self.on_action_selected_callback(action)
+        self._notify(action)
         
         return True
     
+    def _resolve_indexed_target(self, parts: List[str], arg_index: int, candidates: List[Character],
+                                show_fn: Callable[[List[Character]], None], empty_message: str,
+                                prompt: str) -> Optional[Character]:
+        """根据命令参数中的索引从候选列表中选择目标
+        
+        Args:
+            parts: 命令拆分后的部分
+            arg_index: 目标索引参数在命令中的位置
+            candidates: 可选目标列表
+            show_fn: 显示可选目标的方法
+            empty_message: 没有可选目标时的提示
+            prompt: 未指定目标时的提示
+            
+        Returns:
+            选择的目标，无效时返回None
+        """
+        if not candidates:
+            print(empty_message)
+            return None
+        
+        # 如果没有指定目标
+        if len(parts) <= arg_index:
+            show_fn(candidates)
+            print(prompt)
+            return None
+        
+        target_idx = _parse_1based_index(parts[arg_index], len(candidates))
+        if target_idx < 0:
+            print(f"无效的目标索引: {parts[arg_index]}")
+            show_fn(candidates)
+            return None
+        
+        return candidates[target_idx]
+    
+    def _resolve_self_target(self, parts: List[str], character: Character, skill: Skill, skill_idx: int,
+                             own_team: Any, enemy_team: Any) -> Optional[Character]:
+        """自身技能以施法者为目标"""
+        return character
+    
+    def _resolve_enemy_target(self, parts: List[str], character: Character, skill: Skill, skill_idx: int,
+                              own_team: Any, enemy_team: Any) -> Optional[Character]:
+        """单体技能从敌方存活角色中选择目标"""
+        return self._resolve_indexed_target(
+            parts, 2, enemy_team.alive_characters, self._show_enemy_targets,
+            "没有可攻击的目标！",
+            f"请为{skill.name}技能选择一个目标: skill {skill_idx + 1} <目标ID>")
+    
+    def _resolve_ally_target(self, parts: List[str], character: Character, skill: Skill, skill_idx: int,
+                             own_team: Any, enemy_team: Any) -> Optional[Character]:
+        """单体友方技能从友方存活角色中选择目标"""
+        return self._resolve_indexed_target(
+            parts, 2, own_team.alive_characters, self._show_ally_targets,
+            "没有可选择的友方目标！",
+            f"请为{skill.name}技能选择一个友方目标: skill {skill_idx + 1} <目标ID>")
+    
+    def _resolve_group_target(self, parts: List[str], character: Character, skill: Skill, skill_idx: int,
+                              own_team: Any, enemy_team: Any) -> Optional[Character]:
+        """群体技能或随机目标技能不需要指定目标，返回名义上的目标"""
+        if skill.target_type is TargetType.ALL_ALLIES:
+            # 随便选一个友方角色作为名义上的目标
+            return character
+        
+        # 随便选一个敌人作为名义上的目标
+        alive_enemies = enemy_team.alive_characters
+        if not alive_enemies:
+            print("没有可攻击的目标！")
+            return None
+        return alive_enemies[0]
+    
     def _handle_item_command(self, parts: List[str], character: Character) -> bool:
         """处理道具命令
         
@@ -259,10 +320,11 @@ class InputController:
         print("道具系统尚未实现。")
         return False
     
-    def _handle_pass_command(self, character: Character) -> bool:
+    def _handle_pass_command(self, parts: List[str], character: Character) -> bool:
         """处理跳过回合命令
         
         Args:
+            parts: 命令拆分后的部分
             character: 当前行动的角色
             
         Returns:
@@ -272,45 +334,61 @@ class InputController:
         action = Action(character, ActionType.PASS, None, None)
         
         # 通知回调
-        if self.on_action_selected_callback:
-            self.on_action_selected_callback(action)
+        self._notify(action)
         
         return True
     
+    def _handle_help_command(self, parts: List[str], character: Character) -> bool:
+        """处理帮助命令，显示帮助信息后不消耗回合
+        
+        Args:
+            parts: 命令拆分后的部分
+            character: 当前行动的角色
+            
+        Returns:
+            始终返回False
+        """
+        self._show_help()
+        return False
+    
+    def _handle_status_command(self, parts: List[str], character: Character) -> bool:
+        """处理状态命令，显示战斗状态后不消耗回合
+        
+        Args:
+            parts: 命令拆分后的部分
+            character: 当前行动的角色
+            
+        Returns:
+            始终返回False
+        """
+        self._show_battle_status()
+        return False
+    
     def _show_help(self) -> None:
         """显示帮助信息"""
-        print("可用命令:")
-        print("  attack/a [目标ID] - 对指定目标进行普通攻击")
-        print("  skill/s [技能ID] [目标ID] - 使用指定技能攻击指定目标")
-        print("  item/i [道具ID] [目标ID] - 使用指定道具（尚未实现）")
-        print("  pass/p - 跳过当前回合")
-        print("  status/st - 显示战斗状态")
-        print("  help/h - 显示此帮助信息")
+        sys.stdout.write(_HELP_TEXT)
     
     def _show_battle_status(self) -> None:
         """显示战斗状态"""
-        print("\n===== 战斗状态 =====")
-        print(f"当前回合: {self.battle_state.current_round}")
-        
-        # 显示队伍A的状态
-        print(f"\n队伍 {self.battle_state.team_a.name}:")
-        for i, character in enumerate(self.battle_state.team_a.characters):
-            status = "存活" if character.is_alive else "阵亡"
-            print(f"  {i+1}. {character.name} - HP: {character.hp}/{character.max_hp} CP: {character.chakra}/{character.max_chakra} ({status})")
-            if character.status_effects:
-                effect_texts = [f"{effect.effect_type.name}({effect.duration}回合)" for effect in character.status_effects]
-                print(f"     状态: {', '.join(effect_texts)}")
-        
-        # 显示队伍B的状态
-        print(f"\n队伍 {self.battle_state.team_b.name}:")
-        for i, character in enumerate(self.battle_state.team_b.characters):
-            status = "存活" if character.is_alive else "阵亡"
-            print(f"  {i+1}. {character.name} - HP: {character.hp}/{character.max_hp} CP: {character.chakra}/{character.max_chakra} ({status})")
-            if character.status_effects:
-                effect_texts = [f"{effect.effect_type.name}({effect.duration}回合)" for effect in character.status_effects]
-                print(f"     状态: {', '.join(effect_texts)}")
-        
-        print("\n===================")
+        # 收集所有行后一次性输出
+        out: List[str] = ["\n===== 战斗状态 =====", f"当前回合: {self.battle_state.current_round}"]
+        
+        # 显示双方队伍的状态
+        for team in (self.battle_state.team_a, self.battle_state.team_b):
+            self._render_team_status(team, out)
+        
+        out.append("\n===================\n")
+        sys.stdout.write("\n".join(out))
+    
+    def _render_team_status(self, team: Any, out: List[str]) -> None:
+        """将队伍中各角色的状态行追加到输出列表
+        
+        Args:
+            team: 要显示的队伍
+            out: 输出行列表
+        """
+        out.append(f"\n队伍 {team.name}:")
+        out.extend(f"  {i+1}. {character.status_line()}" for i, character in enumerate(team.characters))
     
     def _show_character_skills(self, character: Character) -> None:
         """显示角色的技能列表
@@ -318,11 +396,12 @@ class InputController:
         Args:
             character: 要显示技能的角色
         """
-        print(f"\n{character.name}的技能列表:")
+        out: List[str] = [f"\n{character.name}的技能列表:"]
         for i, skill in enumerate(character.skills):
             cost_str = f"CP: {skill.cost}"
-            print(f"  {i+1}. {skill.name} [{cost_str}] - {skill.description} (目标: {skill.target_type.name})")
-        print("\n使用方式: skill <技能ID> [目标ID]")
+            out.append(f"  {i+1}. {skill.name} [{cost_str}] - {skill.description} (目标: {skill.target_type.name})")
+        out.append("\n使用方式: skill <技能ID> [目标ID]\n")
+        sys.stdout.write("\n".join(out))
     
     def _show_enemy_targets(self, enemies: List[Character]) -> None:
         """显示敌方目标列表
@@ -330,9 +409,7 @@ class InputController:
         Args:
             enemies: 敌方角色列表
         """
-        print("\n可选的敌方目标:")
-        for i, enemy in enumerate(enemies):
-            print(f"  {i+1}. {enemy.name} - HP: {enemy.hp}/{enemy.max_hp}")
+        self._show_targets("\n可选的敌方目标:", enemies)
     
     def _show_ally_targets(self, allies: List[Character]) -> None:
         """显示友方目标列表
@@ -340,6 +417,16 @@ class InputController:
         Args:
             allies: 友方角色列表
         """
-        print("\n可选的友方目标:")
-        for i, ally in enumerate(allies):
-            print(f"  {i+1}. {ally.name} - HP: {ally.hp}/{ally.max_hp}") 
\ No newline at end of file
+        self._show_targets("\n可选的友方目标:", allies)
+    
+    def _show_targets(self, title: str, targets: List[Character]) -> None:
+        """一次性输出目标列表
+        
+        Args:
+            title: 列表标题
+            targets: 目标角色列表
+        """
+        out: List[str] = [title]
+        out.extend(f"  {i+1}. {target.name} - HP: {target.hp}/{target.max_hp}" for i, target in enumerate(targets))
+        out.append("")
+        sys.stdout.write("\n".join(out))
\ No newline at end of file
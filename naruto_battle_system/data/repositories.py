@@ -2,63 +2,425 @@
 数据存储库
 提供对游戏数据的访问接口和实现
 """
-import json
+import atexit
+import gzip
 import os
-from typing import Dict, List, Optional, TypeVar, Generic, Type
-from ..interfaces.battle_interfaces import IRepository
+import pickle
+import sys
+import threading
+import weakref
+from contextlib import contextmanager
+from dataclasses import fields
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, TypeVar, Generic, Type
 from ..models.character import Character
 from ..models.skill import Skill, SkillEffect
 from ..models.status_effect import InstantEffect, PeriodicEffect, StatModifier, StatusEffectDefinition
 from ..models.enums import *
+from ..utils.logger import game_logger
+from ..config.game_config import game_config
+from ..utils.json_codec import json_loads as _json_loads, json_dumps as _json_dumps
+
+# 大数据文件使用ijson流式解析，未安装时整体读入后解析
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# 超过该大小的数据文件逐条流式解析，避免整个文件内容与解析结果同时驻留内存
+_STREAM_PARSE_THRESHOLD = 4 * 1024 * 1024
+
+# gzip文件头，加载时据此识别压缩的数据文件
+_GZIP_MAGIC = b'\x1f\x8b'
+
+# 实体缓存文件的结构标记：slots数据类反序列化时按当前字段顺序恢复状态，
+# 模型字段变化后旧缓存会恢复到错误的字段上，因此结构不一致的缓存视为失效
+_CACHE_SCHEMA = tuple((cls.__qualname__, tuple(f.name for f in fields(cls)))
+                      for cls in (Character, Skill, SkillEffect, StatusEffectDefinition,
+                                  InstantEffect, PeriodicEffect, StatModifier))
+
+# fdatasync只同步文件数据，不强制刷新修改时间等元数据；不支持的平台退回fsync
+_fdatasync = getattr(os, 'fdatasync', os.fsync)
+
+
+def _write_file_atomic(path: str, payload: bytes, durable: bool) -> None:
+    """
+    先写入临时文件再替换目标文件，写入中途崩溃不会损坏原文件
+    
+    Args:
+        path: 目标文件路径
+        payload: 完整的文件内容
+        durable: 是否在替换前等待数据写入磁盘
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+        if durable:
+            f.flush()
+            _fdatasync(f.fileno())
+    os.replace(tmp_path, path)
 
 T = TypeVar('T')
 
+
+class _BackgroundWriter:
+    """
+    后台写入线程，数据在调用方线程序列化后交由单个后台线程写入文件，
+    同一文件尚未写入的多个快照只保留最后一个
+    """
+    
+    def __init__(self):
+        self._pending: Dict[str, Tuple[bytes, bool]] = {}
+        self._condition = threading.Condition()
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+        
+    def submit(self, path: str, payload: bytes, durable: bool) -> None:
+        """
+        提交待写入的文件内容
+        
+        Args:
+            path: 文件路径
+            payload: 完整的文件内容
+            durable: 是否在替换文件前同步到磁盘
+        """
+        with self._condition:
+            self._pending[path] = (payload, durable)
+            if self._thread is None:
+                # 使用守护线程，解释器退出时由atexit中的drain等待写完
+                self._thread = threading.Thread(target=self._run, name='repository-writer', daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+            
+    def drain(self) -> None:
+        """等待所有已提交的内容写入完成"""
+        with self._condition:
+            while self._pending or self._busy:
+                self._condition.wait()
+                
+    def _run(self) -> None:
+        """后台线程主循环"""
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                path = next(iter(self._pending))
+                payload, durable = self._pending.pop(path)
+                self._busy = True
+            try:
+                _write_file_atomic(path, payload, durable)
+            except Exception as e:
+                game_logger.error("保存数据时出错: %s", e)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+
+_writer = _BackgroundWriter()
+# 先于存储库的保存钩子注册，atexit按注册的逆序执行，因此在存储库写入未保存的修改之后再等待写完
+atexit.register(_writer.drain)
+
+# 已创建的存储库，进程退出时统一写入未保存的修改；使用弱引用，不延长存储库的生命周期
+_repositories: "weakref.WeakSet[JsonRepository]" = weakref.WeakSet()
+
+
+def _flush_repositories() -> None:
+    """进程退出时写入所有存储库尚未保存的修改"""
+    for repository in list(_repositories):
+        repository.flush()
+
+
+atexit.register(_flush_repositories)
+
+
+def _kwargs_from_dict(data: Dict, required: Tuple[str, ...], optional: Dict[str, Any],
+                      enums: Dict[str, Mapping[str, Any]], aliases: Optional[Dict[str, str]] = None,
+                      interned: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """
+    按字段表从数据字典构造模型构造参数
+    
+    Args:
+        data: 数据字典
+        required: 必需字段
+        optional: 可选字段及默认值，可调用的默认值（如list）每次调用生成新对象
+        enums: 以枚举名称存储的字段及其枚举成员表（名称到成员的映射）
+        aliases: 数据键与构造参数名不一致的字段映射
+        interned: 取值重复度高的字符串（或字符串列表）字段，加载时驻留以共享同一对象
+        
+    Returns:
+        构造参数字典
+    """
+    kwargs = {key: data[key] for key in required}
+    for key, default in optional.items():
+        if key in data:
+            kwargs[key] = data[key]
+        else:
+            kwargs[key] = default() if callable(default) else default
+    for key, members in enums.items():
+        value = kwargs.get(key)
+        if value is not None:
+            kwargs[key] = members[value]
+    for key in interned:
+        value = kwargs[key]
+        if isinstance(value, str):
+            kwargs[key] = sys.intern(value)
+        else:
+            kwargs[key] = [sys.intern(item) for item in value]
+    if aliases:
+        for key, name in aliases.items():
+            kwargs[name] = kwargs.pop(key)
+    return kwargs
+
+
+# 枚举名称到成员的映射，直接查表以避开Enum[name]经元类的查找
+_EFFECT_TYPES = EffectType.__members__
+_REMOVE_STATUS_TYPES = RemoveStatusType.__members__
+_SKILL_TYPES = SkillType.__members__
+_TARGET_TYPES = TargetType.__members__
+_CHASE_STATES = ChaseState.__members__
+_STATUS_TYPES = StatusType.__members__
+
+# 技能效果的字段表
+_SKILL_EFFECT_REQUIRED = ('effect_type', 'value_formula')
+_SKILL_EFFECT_OPTIONAL = {
+    'status_id_to_apply': None,
+    'apply_chance': 1.0,
+    'remove_status_type': None,
+    'specific_status_id': None,
+    'chakra_change_amount': 0,
+    'summon_character_id': None,
+}
+_SKILL_EFFECT_ENUMS = {'effect_type': _EFFECT_TYPES, 'remove_status_type': _REMOVE_STATUS_TYPES}
+
+# 即时效果、周期性效果和属性修改器的字段表
+_FORMULA_EFFECT_REQUIRED = ('effect_type', 'value_formula')
+_FORMULA_EFFECT_ENUMS = {'effect_type': _EFFECT_TYPES}
+_STAT_MODIFIER_REQUIRED = ('stat_name', 'value', 'is_percentage')
+
+# 公式和属性名取自少量固定取值，驻留后各实体共享同一字符串对象
+_FORMULA_INTERNED = ('value_formula',)
+_STAT_MODIFIER_INTERNED = ('stat_name',)
+
 class JsonRepository(Generic[T]):
-    """JSON数据存储库基类"""
+    """JSON数据存储库基类，满足IRepository协议"""
+    
+    # 字典到实体的字段转换表，由子类声明
+    _ENTITY_NAME = "实体"                  # 出错提示中使用的实体名称
+    _REQUIRED: Tuple[str, ...] = ()       # 必需字段
+    _OPTIONAL: Dict[str, Any] = {}        # 可选字段及默认值
+    _ENUMS: Dict[str, Mapping[str, Any]] = {}  # 以枚举名称存储的字段及其成员表
+    _ALIASES: Dict[str, str] = {}         # 数据键与构造参数名不一致的字段
+    _INTERNED: Tuple[str, ...] = ()       # 加载时驻留的字符串字段
     
     def __init__(self, data_file: str, model_class: Type[T]):
         """
         初始化存储库
         
         Args:
-            data_file: 数据文件路径
+            data_file: 数据文件路径，以.gz结尾时使用gzip压缩保存
             model_class: 模型类
         """
         self.data_file = data_file
+        self._cache_file = data_file + '.pkl'
+        # 数据目录只在初始化时创建一次，保存时无需再检查
+        os.makedirs(os.path.dirname(data_file) or '.', exist_ok=True)
         self.model_class = model_class
         self.entities: Dict[str, T] = {}
-        self.load_data()
+        # 是否有未写入文件的修改，以及修改后是否立即保存；默认只标记修改，
+        # 在调用flush、batch结束或进程退出时才写入文件
+        self._dirty = False
+        self._autosave = False
+        # get_all返回的实体列表缓存，实体增删改时失效
+        self._all_cache: Optional[List[T]] = None
+        # 数据版本号，每次加载或修改时递增，供外部缓存判断是否失效
+        self.version = 0
+        # 数据文件延迟到首次访问时才加载
+        self._loaded = False
+        # 所属的合并数据文件，设置后加载和保存都由其统一处理
+        self._bundle: Optional["BundleRepository"] = None
+        # 进程退出时写入尚未保存的修改，被丢弃的存储库需由调用方先调用flush
+        _repositories.add(self)
         
     def load_data(self) -> None:
         """从文件加载数据"""
+        if self._bundle is not None:
+            self._bundle.load(self)
+            return
+        self._load_file()
+        
+    def _load_file(self) -> None:
+        """从存储库自身的数据文件加载数据"""
+        self._loaded = True
+        self._all_cache = None
+        self.version += 1
+        # 等待后台线程写完，避免读到写入到一半的文件
+        _writer.drain()
         if not os.path.exists(self.data_file):
             self.entities = {}
             return
             
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                for item in data:
-                    entity = self._create_entity_from_dict(item)
-                    if entity:
-                        self.entities[getattr(entity, 'id')] = entity
+            cache_key = self._get_cache_key()
+            
+            # 数据文件未变化时直接使用缓存的实体，跳过JSON解析和逐个构造
+            cached_entities = self._load_cache(cache_key)
+            if cached_entities is not None:
+                self.entities = cached_entities
+                return
+            
+            with open(self.data_file, 'rb') as f:
+                # 按文件头识别gzip压缩的数据文件，与文件扩展名无关
+                compressed = f.read(2) == _GZIP_MAGIC
+                f.seek(0)
+                stream = gzip.GzipFile(fileobj=f, mode='rb') if compressed else f
+                # 纯Python的流式解析在小文件上更慢，仅对大文件启用
+                if ijson is not None and os.path.getsize(self.data_file) > _STREAM_PARSE_THRESHOLD:
+                    data = ijson.items(stream, 'item', use_float=True)
+                else:
+                    data = _json_loads(stream.read())
+                self._load_items(data)
+            self._save_cache(cache_key)
         except Exception as e:
-            print(f"加载数据时出错: {str(e)}")
+            game_logger.error("加载数据时出错: %s", e)
             self.entities = {}
             
+    def _load_items(self, items: Iterable[Dict]) -> None:
+        """
+        由实体数据字典序列创建全部实体
+        
+        Args:
+            items: 实体数据字典序列
+        """
+        self._loaded = True
+        self._all_cache = None
+        self.version += 1
+        entities = {}
+        for item in items:
+            entity = self._create_entity_from_dict(item)
+            if entity:
+                entities[getattr(entity, 'id')] = entity
+        self.entities = entities
+        
+    def _dump_items(self) -> List[Dict]:
+        """
+        将全部实体转换为数据字典列表
+        
+        Returns:
+            实体数据字典列表
+        """
+        return [self._convert_entity_to_dict(entity) for entity in self.entities.values()]
+        
+    def _get_cache_key(self) -> Tuple[int, int]:
+        """
+        获取数据文件的缓存键
+        
+        Returns:
+            数据文件的(修改时间, 文件大小)
+        """
+        stat = os.stat(self.data_file)
+        return stat.st_mtime_ns, stat.st_size
+        
+    def _load_cache(self, cache_key: Tuple[int, int]) -> Optional[Dict[str, T]]:
+        """
+        从缓存文件加载实体
+        
+        Args:
+            cache_key: 当前数据文件的缓存键
+            
+        Returns:
+            缓存的实体字典，如果缓存不存在、已过期或模型结构已变化则为None
+        """
+        try:
+            with open(self._cache_file, 'rb') as f:
+                # 先读取文件头，不匹配时无需反序列化实体
+                if pickle.load(f) != (_CACHE_SCHEMA, cache_key[0], cache_key[1]):
+                    return None
+                return pickle.load(f)
+        except Exception:
+            pass
+        return None
+        
+    def _save_cache(self, cache_key: Tuple[int, int]) -> None:
+        """
+        将实体写入缓存文件，写入失败时忽略
+        
+        Args:
+            cache_key: 当前数据文件的缓存键
+        """
+        try:
+            with open(self._cache_file, 'wb') as f:
+                pickle.dump((_CACHE_SCHEMA, cache_key[0], cache_key[1]), f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(self.entities, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            pass
+            
+    def _ensure_loaded(self) -> None:
+        """首次访问数据前加载数据文件"""
+        if not self._loaded:
+            self.load_data()
+            
     def save_data(self) -> None:
-        """保存数据到文件"""
-        data = []
-        for entity in self.entities.values():
-            data.append(self._convert_entity_to_dict(entity))
+        """保存数据到文件，序列化在当前线程完成，写入由后台线程执行"""
+        self._ensure_loaded()
+        if self._bundle is not None:
+            self._bundle.save()
+            return
+        data = self._dump_items()
+            
+        if self.data_file.endswith('.gz'):
+            # 压缩文件不供人工查看，省去缩进；低压缩级别即可获得大部分收益
+            payload = gzip.compress(_json_dumps(data, indent=False), compresslevel=3)
+        else:
+            payload = _json_dumps(data)
+        durable = game_config.get_data_config().get("sync_writes", True)
+        _writer.submit(self.data_file, payload, durable)
+            
+    def flush(self) -> None:
+        """将未保存的修改写入文件"""
+        if self._dirty:
+            self.save_data()
+            self._dirty = False
             
-        os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+    @contextmanager
+    def batch(self) -> Iterator["JsonRepository[T]"]:
+        """
+        批量修改上下文，期间的修改只在退出时写入一次文件
+        
+        Returns:
+            存储库自身
+        """
+        previous_autosave = self._autosave
+        self._autosave = False
+        try:
+            yield self
+        finally:
+            self._autosave = previous_autosave
+            self.flush()
+            
+    def _mark_dirty(self) -> None:
+        """标记数据已修改，自动保存开启时立即写入文件"""
+        self._dirty = True
+        self._all_cache = None
+        self.version += 1
+        if self._autosave:
+            self.flush()
+            
+    def _entity_kwargs(self, data: Dict) -> Dict[str, Any]:
+        """
+        按子类声明的字段表构造实体的构造参数，嵌套对象由子类重写处理
+        
+        Args:
+            data: 实体数据字典
             
+        Returns:
+            构造参数字典
+        """
+        return _kwargs_from_dict(data, self._REQUIRED, self._OPTIONAL, self._ENUMS, self._ALIASES,
+                                 interned=self._INTERNED)
+        
     def _create_entity_from_dict(self, data: Dict) -> Optional[T]:
         """
-        从字典创建实体对象，子类需要重写此方法
+        从字典创建实体对象
         
         Args:
             data: 实体数据字典
@@ -66,7 +428,16 @@ class JsonRepository(Generic[T]):
         Returns:
             创建的实体对象，如果创建失败则为None
         """
-        raise NotImplementedError("子类必须实现此方法")
+        # 先检查必需字段，常见的数据缺失无需经过异常处理
+        missing = [key for key in self._REQUIRED if key not in data]
+        if missing:
+            game_logger.error("创建%s时出错: 缺少字段 %s", self._ENTITY_NAME, ', '.join(missing))
+            return None
+        try:
+            return self.model_class(**self._entity_kwargs(data))
+        except Exception as e:
+            game_logger.error("创建%s时出错: %s", self._ENTITY_NAME, e)
+            return None
         
     def _convert_entity_to_dict(self, entity: T) -> Dict:
         """
@@ -90,6 +461,7 @@ class JsonRepository(Generic[T]):
         Returns:
             实体对象，如果不存在则为None
         """
+        self._ensure_loaded()
         return self.entities.get(id)
         
     def add(self, entity: T) -> None:
@@ -99,8 +471,9 @@ class JsonRepository(Generic[T]):
         Args:
             entity: 要添加的实体
         """
+        self._ensure_loaded()
         self.entities[getattr(entity, 'id')] = entity
-        self.save_data()
+        self._mark_dirty()
         
     def update(self, entity: T) -> None:
         """
@@ -109,9 +482,10 @@ class JsonRepository(Generic[T]):
         Args:
             entity: 要更新的实体
         """
+        self._ensure_loaded()
         if getattr(entity, 'id') in self.entities:
             self.entities[getattr(entity, 'id')] = entity
-            self.save_data()
+            self._mark_dirty()
         
     def remove(self, id: str) -> bool:
         """
@@ -123,9 +497,10 @@ class JsonRepository(Generic[T]):
         Returns:
             是否成功移除
         """
+        self._ensure_loaded()
         if id in self.entities:
             del self.entities[id]
-            self.save_data()
+            self._mark_dirty()
             return True
         return False
         
@@ -134,13 +509,45 @@ class JsonRepository(Generic[T]):
         获取所有实体
         
         Returns:
-            所有实体的列表
+            所有实体的列表，该列表为共享缓存，调用方不应修改
+        """
+        all_cache = self._all_cache
+        if all_cache is None:
+            self._ensure_loaded()
+            all_cache = self._all_cache = list(self.entities.values())
+        return all_cache
+        
+    def iter_all(self) -> Iterable[T]:
+        """
+        遍历所有实体，不复制列表，遍历期间不能增删实体
+        
+        Returns:
+            所有实体的只读视图
         """
-        return list(self.entities.values())
+        self._ensure_loaded()
+        return self.entities.values()
 
-class CharacterRepository(JsonRepository[Character], IRepository[Character]):
+class CharacterRepository(JsonRepository[Character]):
     """角色数据存储库"""
     
+    _ENTITY_NAME = "角色"
+    _REQUIRED = ('id', 'name', 'max_hp', 'current_hp', 'attack', 'defense', 'ninja_tech',
+                 'resistance', 'speed', 'crit_rate', 'crit_damage_bonus', 'position',
+                 'normal_attack_id', 'mystery_art_id')
+    _OPTIONAL = {
+        'chase_skill_ids': list,
+        'passive_skill_ids': list,
+        'tags': list,
+        'is_alive': True,
+        'can_act': True,
+        'is_summon': False,
+        'summoner_id': None,
+    }
+    # 数据文件沿用current_hp键保存当前生命值
+    _ALIASES = {'current_hp': 'hp'}
+    # 标签在角色间大量重复
+    _INTERNED = ('tags',)
+    
     def __init__(self, data_file: str = 'data/characters.json'):
         """
         初始化角色存储库
@@ -150,44 +557,6 @@ class CharacterRepository(JsonRepository[Character], IRepository[Character]):
         """
         super().__init__(data_file, Character)
         
-    def _create_entity_from_dict(self, data: Dict) -> Optional[Character]:
-        """
-        从字典创建角色对象
-        
-        Args:
-            data: 角色数据字典
-            
-        Returns:
-            创建的角色对象，如果创建失败则为None
-        """
-        try:
-            return Character(
-                id=data['id'],
-                name=data['name'],
-                max_hp=data['max_hp'],
-                current_hp=data['current_hp'],
-                attack=data['attack'],
-                defense=data['defense'],
-                ninja_tech=data['ninja_tech'],
-                resistance=data['resistance'],
-                speed=data['speed'],
-                crit_rate=data['crit_rate'],
-                crit_damage_bonus=data['crit_damage_bonus'],
-                position=data['position'],
-                normal_attack_id=data['normal_attack_id'],
-                mystery_art_id=data['mystery_art_id'],
-                chase_skill_ids=data.get('chase_skill_ids', []),
-                passive_skill_ids=data.get('passive_skill_ids', []),
-                tags=data.get('tags', []),
-                is_alive=data.get('is_alive', True),
-                can_act=data.get('can_act', True),
-                is_summon=data.get('is_summon', False),
-                summoner_id=data.get('summoner_id')
-            )
-        except Exception as e:
-            print(f"创建角色时出错: {str(e)}")
-            return None
-            
     def _convert_entity_to_dict(self, entity: Character) -> Dict:
         """
         将角色对象转换为字典
@@ -202,7 +571,7 @@ class CharacterRepository(JsonRepository[Character], IRepository[Character]):
             'id': entity.id,
             'name': entity.name,
             'max_hp': entity.max_hp,
-            'current_hp': entity.current_hp,
+            'current_hp': entity.hp,
             'attack': entity.attack,
             'defense': entity.defense,
             'ninja_tech': entity.ninja_tech,
@@ -222,9 +591,32 @@ class CharacterRepository(JsonRepository[Character], IRepository[Character]):
             'summoner_id': entity.summoner_id
         }
 
-class SkillRepository(JsonRepository[Skill], IRepository[Skill]):
+class SkillRepository(JsonRepository[Skill]):
     """技能数据存储库"""
     
+    _ENTITY_NAME = "技能"
+    _REQUIRED = ('id', 'name', 'type', 'description', 'target_type')
+    _OPTIONAL = {
+        'chakra_cost': 0,
+        'cooldown_turns': 0,
+        'current_cooldown': 0,
+        'target_count': 1,
+        'effects': list,
+        'causes_chase_state': 'NONE',
+        'requires_chase_state': 'NONE',
+        'chase_priority': 0,
+        'is_interruptible': True,
+        'is_instant': False,
+    }
+    _ENUMS = {
+        'type': _SKILL_TYPES,
+        'target_type': _TARGET_TYPES,
+        'causes_chase_state': _CHASE_STATES,
+        'requires_chase_state': _CHASE_STATES,
+    }
+    # 数据文件中的type对应技能模型的skill_type字段
+    _ALIASES = {'type': 'skill_type'}
+    
     def __init__(self, data_file: str = 'data/skills.json'):
         """
         初始化技能存储库
@@ -234,51 +626,24 @@ class SkillRepository(JsonRepository[Skill], IRepository[Skill]):
         """
         super().__init__(data_file, Skill)
         
-    def _create_entity_from_dict(self, data: Dict) -> Optional[Skill]:
+    def _entity_kwargs(self, data: Dict) -> Dict[str, Any]:
         """
-        从字典创建技能对象
+        构造技能的参数，效果列表逐项转换为技能效果对象
         
         Args:
             data: 技能数据字典
             
         Returns:
-            创建的技能对象，如果创建失败则为None
-        """
-        try:
-            effects = []
-            for effect_data in data.get('effects', []):
-                effect = SkillEffect(
-                    effect_type=EffectType[effect_data['effect_type']],
-                    value_formula=effect_data['value_formula'],
-                    status_id_to_apply=effect_data.get('status_id_to_apply'),
-                    apply_chance=effect_data.get('apply_chance', 1.0),
-                    remove_status_type=RemoveStatusType[effect_data['remove_status_type']] if effect_data.get('remove_status_type') else None,
-                    specific_status_id=effect_data.get('specific_status_id'),
-                    chakra_change_amount=effect_data.get('chakra_change_amount', 0),
-                    summon_character_id=effect_data.get('summon_character_id')
-                )
-                effects.append(effect)
-                
-            return Skill(
-                id=data['id'],
-                name=data['name'],
-                type=SkillType[data['type']],
-                description=data['description'],
-                chakra_cost=data.get('chakra_cost', 0),
-                cooldown_turns=data.get('cooldown_turns', 0),
-                current_cooldown=data.get('current_cooldown', 0),
-                target_type=TargetType[data['target_type']],
-                target_count=data.get('target_count', 1),
-                effects=effects,
-                causes_chase_state=ChaseState[data.get('causes_chase_state', 'NONE')],
-                requires_chase_state=ChaseState[data.get('requires_chase_state', 'NONE')],
-                chase_priority=data.get('chase_priority', 0),
-                is_interruptible=data.get('is_interruptible', True),
-                is_instant=data.get('is_instant', False)
-            )
-        except Exception as e:
-            print(f"创建技能时出错: {str(e)}")
-            return None
+            技能构造参数
+        """
+        kwargs = super()._entity_kwargs(data)
+        kwargs['effects'] = [
+            SkillEffect(**_kwargs_from_dict(effect_data, _SKILL_EFFECT_REQUIRED,
+                                            _SKILL_EFFECT_OPTIONAL, _SKILL_EFFECT_ENUMS,
+                                            interned=_FORMULA_INTERNED))
+            for effect_data in kwargs['effects']
+        ]
+        return kwargs
             
     def _convert_entity_to_dict(self, entity: Skill) -> Dict:
         """
@@ -290,10 +655,11 @@ class SkillRepository(JsonRepository[Skill], IRepository[Skill]):
         Returns:
             转换后的字典
         """
+        # 枚举成员名直接读取_name_，绕过Enum.name属性描述符
         effects = []
         for effect in entity.effects:
             effect_dict = {
-                'effect_type': effect.effect_type.name,
+                'effect_type': effect.effect_type._name_,
                 'value_formula': effect.value_formula
             }
             
@@ -304,7 +670,7 @@ class SkillRepository(JsonRepository[Skill], IRepository[Skill]):
                 effect_dict['apply_chance'] = effect.apply_chance
                 
             if effect.remove_status_type:
-                effect_dict['remove_status_type'] = effect.remove_status_type.name
+                effect_dict['remove_status_type'] = effect.remove_status_type._name_
                 
             if effect.specific_status_id:
                 effect_dict['specific_status_id'] = effect.specific_status_id
@@ -320,24 +686,42 @@ class SkillRepository(JsonRepository[Skill], IRepository[Skill]):
         return {
             'id': entity.id,
             'name': entity.name,
-            'type': entity.type.name,
+            'type': entity.skill_type._name_,
             'description': entity.description,
             'chakra_cost': entity.chakra_cost,
             'cooldown_turns': entity.cooldown_turns,
             'current_cooldown': entity.current_cooldown,
-            'target_type': entity.target_type.name,
+            'target_type': entity.target_type._name_,
             'target_count': entity.target_count,
             'effects': effects,
-            'causes_chase_state': entity.causes_chase_state.name,
-            'requires_chase_state': entity.requires_chase_state.name,
+            'causes_chase_state': entity.causes_chase_state._name_,
+            'requires_chase_state': entity.requires_chase_state._name_,
             'chase_priority': entity.chase_priority,
             'is_interruptible': entity.is_interruptible,
             'is_instant': entity.is_instant
         }
 
-class StatusEffectRepository(JsonRepository[StatusEffectDefinition], IRepository[StatusEffectDefinition]):
+class StatusEffectRepository(JsonRepository[StatusEffectDefinition]):
     """状态效果数据存储库"""
     
+    _ENTITY_NAME = "状态效果"
+    _REQUIRED = ('id', 'name', 'type', 'icon', 'description', 'max_stacks', 'duration_turns')
+    _OPTIONAL = {
+        'is_permanent': False,
+        'on_apply_effects': list,
+        'on_turn_start_effects': list,
+        'on_turn_end_effects': list,
+        'on_remove_effects': list,
+        'modifiers': list,
+        'prevents_action': False,
+        'prevents_chase': False,
+        'prevents_mystery': False,
+        'is_dispellable': True,
+        'is_dispelled_by': list,
+        'is_immunity_bypassed_by': list,
+    }
+    _ENUMS = {'type': _STATUS_TYPES}
+    
     def __init__(self, data_file: str = 'data/status_effects.json'):
         """
         初始化状态效果存储库
@@ -347,69 +731,26 @@ class StatusEffectRepository(JsonRepository[StatusEffectDefinition], IRepository
         """
         super().__init__(data_file, StatusEffectDefinition)
         
-    def _create_entity_from_dict(self, data: Dict) -> Optional[StatusEffectDefinition]:
+    def _entity_kwargs(self, data: Dict) -> Dict[str, Any]:
         """
-        从字典创建状态效果对象
+        构造状态效果定义的参数，嵌套的效果和修改器列表逐项转换为对象
         
         Args:
             data: 状态效果数据字典
             
         Returns:
-            创建的状态效果对象，如果创建失败则为None
-        """
-        try:
-            # 创建即时效果列表
-            on_apply_effects = []
-            for effect_data in data.get('on_apply_effects', []):
-                effect = self._create_instant_effect_from_dict(effect_data)
-                on_apply_effects.append(effect)
-                
-            on_remove_effects = []
-            for effect_data in data.get('on_remove_effects', []):
-                effect = self._create_instant_effect_from_dict(effect_data)
-                on_remove_effects.append(effect)
-                
-            # 创建周期性效果列表
-            on_turn_start_effects = []
-            for effect_data in data.get('on_turn_start_effects', []):
-                effect = self._create_periodic_effect_from_dict(effect_data)
-                on_turn_start_effects.append(effect)
-                
-            on_turn_end_effects = []
-            for effect_data in data.get('on_turn_end_effects', []):
-                effect = self._create_periodic_effect_from_dict(effect_data)
-                on_turn_end_effects.append(effect)
-                
-            # 创建属性修改器列表
-            modifiers = []
-            for modifier_data in data.get('modifiers', []):
-                modifier = self._create_stat_modifier_from_dict(modifier_data)
-                modifiers.append(modifier)
-                
-            return StatusEffectDefinition(
-                id=data['id'],
-                name=data['name'],
-                type=StatusType[data['type']],
-                icon=data['icon'],
-                description=data['description'],
-                max_stacks=data['max_stacks'],
-                duration_turns=data['duration_turns'],
-                is_permanent=data.get('is_permanent', False),
-                on_apply_effects=on_apply_effects,
-                on_turn_start_effects=on_turn_start_effects,
-                on_turn_end_effects=on_turn_end_effects,
-                on_remove_effects=on_remove_effects,
-                modifiers=modifiers,
-                prevents_action=data.get('prevents_action', False),
-                prevents_chase=data.get('prevents_chase', False),
-                prevents_mystery=data.get('prevents_mystery', False),
-                is_dispellable=data.get('is_dispellable', True),
-                is_dispelled_by=data.get('is_dispelled_by', []),
-                is_immunity_bypassed_by=data.get('is_immunity_bypassed_by', [])
-            )
-        except Exception as e:
-            print(f"创建状态效果时出错: {str(e)}")
-            return None
+            状态效果定义构造参数
+        """
+        kwargs = super()._entity_kwargs(data)
+        # 创建即时效果列表
+        kwargs['on_apply_effects'] = [self._create_instant_effect_from_dict(d) for d in kwargs['on_apply_effects']]
+        kwargs['on_remove_effects'] = [self._create_instant_effect_from_dict(d) for d in kwargs['on_remove_effects']]
+        # 创建周期性效果列表
+        kwargs['on_turn_start_effects'] = [self._create_periodic_effect_from_dict(d) for d in kwargs['on_turn_start_effects']]
+        kwargs['on_turn_end_effects'] = [self._create_periodic_effect_from_dict(d) for d in kwargs['on_turn_end_effects']]
+        # 创建属性修改器列表
+        kwargs['modifiers'] = [self._create_stat_modifier_from_dict(d) for d in kwargs['modifiers']]
+        return kwargs
             
     def _convert_entity_to_dict(self, entity: StatusEffectDefinition) -> Dict:
         """
@@ -447,7 +788,7 @@ class StatusEffectRepository(JsonRepository[StatusEffectDefinition], IRepository
         return {
             'id': entity.id,
             'name': entity.name,
-            'type': entity.type.name,
+            'type': entity.type._name_,
             'icon': entity.icon,
             'description': entity.description,
             'max_stacks': entity.max_stacks,
@@ -468,40 +809,30 @@ class StatusEffectRepository(JsonRepository[StatusEffectDefinition], IRepository
         
     def _create_instant_effect_from_dict(self, data: Dict) -> 'InstantEffect':
         """从字典创建即时效果"""
-        from ..models.status_effect import InstantEffect
-        return InstantEffect(
-            effect_type=EffectType[data['effect_type']],
-            value_formula=data['value_formula']
-        )
+        return InstantEffect(**_kwargs_from_dict(data, _FORMULA_EFFECT_REQUIRED, {}, _FORMULA_EFFECT_ENUMS,
+                                                 interned=_FORMULA_INTERNED))
         
     def _create_periodic_effect_from_dict(self, data: Dict) -> 'PeriodicEffect':
         """从字典创建周期性效果"""
-        from ..models.status_effect import PeriodicEffect
-        return PeriodicEffect(
-            effect_type=EffectType[data['effect_type']],
-            value_formula=data['value_formula']
-        )
+        return PeriodicEffect(**_kwargs_from_dict(data, _FORMULA_EFFECT_REQUIRED, {}, _FORMULA_EFFECT_ENUMS,
+                                                  interned=_FORMULA_INTERNED))
         
     def _create_stat_modifier_from_dict(self, data: Dict) -> 'StatModifier':
         """从字典创建属性修改器"""
-        from ..models.status_effect import StatModifier
-        return StatModifier(
-            stat_name=data['stat_name'],
-            value=data['value'],
-            is_percentage=data['is_percentage']
-        )
+        return StatModifier(**_kwargs_from_dict(data, _STAT_MODIFIER_REQUIRED, {}, {},
+                                                interned=_STAT_MODIFIER_INTERNED))
         
     def _convert_instant_effect_to_dict(self, effect: 'InstantEffect') -> Dict:
         """将即时效果转换为字典"""
         return {
-            'effect_type': effect.effect_type.name,
+            'effect_type': effect.effect_type._name_,
             'value_formula': effect.value_formula
         }
         
     def _convert_periodic_effect_to_dict(self, effect: 'PeriodicEffect') -> Dict:
         """将周期性效果转换为字典"""
         return {
-            'effect_type': effect.effect_type.name,
+            'effect_type': effect.effect_type._name_,
             'value_formula': effect.value_formula
         }
         
@@ -511,4 +842,70 @@ class StatusEffectRepository(JsonRepository[StatusEffectDefinition], IRepository
             'stat_name': modifier.stat_name,
             'value': modifier.value,
             'is_percentage': modifier.is_percentage
-        } 
\ No newline at end of file
+        } 
+
+class BundleRepository:
+    """
+    合并存储库，角色、技能和状态效果数据保存在同一个文件中，一次读取和解析即可加载全部数据
+    
+    由配置项data.bundle_data开启；启用后各存储库的独立数据文件（及其gzip、流式解析和缓存文件）
+    仅在合并文件生成前用于迁移已有数据
+    """
+    
+    # 合并文件中的各部分及对应的存储库属性名
+    _SECTIONS = ('characters', 'skills', 'status_effects')
+    
+    def __init__(self, bundle_file: str = 'data/game.bundle'):
+        """
+        初始化合并存储库
+        
+        Args:
+            bundle_file: 合并数据文件路径
+        """
+        self.bundle_file = bundle_file
+        os.makedirs(os.path.dirname(bundle_file) or '.', exist_ok=True)
+        self.characters = CharacterRepository()
+        self.skills = SkillRepository()
+        self.status_effects = StatusEffectRepository()
+        for _, repository in self._repositories():
+            repository._bundle = self
+        
+    def _repositories(self) -> Iterator[Tuple[str, JsonRepository]]:
+        """遍历各部分名称及对应的存储库"""
+        for section in self._SECTIONS:
+            yield section, getattr(self, section)
+            
+    def load(self, requester: JsonRepository) -> None:
+        """
+        从合并文件加载请求的存储库，并顺带加载其他尚未加载的存储库；
+        其他已加载的存储库保留内存中的数据，避免丢弃其未保存的修改
+        
+        Args:
+            requester: 请求加载数据的存储库
+        """
+        sections = [(section, repository) for section, repository in self._repositories()
+                    if repository is requester or not repository._loaded]
+        _writer.drain()
+        if not os.path.exists(self.bundle_file):
+            # 尚未生成合并文件时，各存储库从原有的独立数据文件加载
+            for _, repository in sections:
+                repository._load_file()
+            return
+            
+        try:
+            with open(self.bundle_file, 'rb') as f:
+                data = _json_loads(f.read())
+            for section, repository in sections:
+                repository._load_items(data.get(section, ()))
+        except Exception as e:
+            game_logger.error("加载合并数据时出错: %s", e)
+            for _, repository in sections:
+                repository._load_items(())
+                
+    def save(self) -> None:
+        """将全部存储库的数据写入合并文件"""
+        for _, repository in self._repositories():
+            repository._ensure_loaded()
+        data = {section: repository._dump_items() for section, repository in self._repositories()}
+        durable = game_config.get_data_config().get("sync_writes", True)
+        _writer.submit(self.bundle_file, _json_dumps(data), durable)
\ No newline at end of file
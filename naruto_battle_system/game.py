@@ -5,7 +5,7 @@ from typing import Dict, List, Any, Optional
 from .views.menu_view import MenuView
 from .services.battle_service import BattleService
 from .services.character_service import CharacterService
-from .data.repositories import CharacterRepository
+from .data.repositories import BundleRepository, CharacterRepository
 from .config.game_config import game_config
 from .utils.logger import game_logger
 
@@ -16,7 +16,13 @@ class Game:
     def __init__(self):
         """初始化游戏"""
         self.menu_view = MenuView()
-        self.character_repository = CharacterRepository()
+        # 配置开启合并数据文件时，角色存储库为合并文件的一部分，否则使用独立的数据文件
+        if game_config.get_data_config().get("bundle_data", False):
+            self.data_bundle = BundleRepository()
+            self.character_repository = self.data_bundle.characters
+        else:
+            self.data_bundle = None
+            self.character_repository = CharacterRepository()
         self.character_service = CharacterService(self.character_repository)
         self.battle_service = BattleService(self.character_repository)
         self.running = False
@@ -26,7 +32,9 @@ class Game:
         # 如果没有角色数据，创建默认角色
         if not self.character_repository.get_all():
             game_logger.info("创建默认角色数据")
-            self.character_service.create_default_characters()
+            # 批量创建，结束后只写入一次数据文件
+            with self.character_repository.batch():
+                self.character_service.create_default_characters()
     
     def run(self) -> None:
         """运行游戏主循环"""
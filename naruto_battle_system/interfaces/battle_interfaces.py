@@ -2,8 +2,7 @@
 战斗系统接口定义
 定义了战斗控制器、状态查询和事件系统的所有接口
 """
-from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Callable, Tuple, Optional, TypeVar, Generic, TYPE_CHECKING
+from typing import List, Dict, Any, Callable, Iterable, Tuple, Optional, TypeVar, Generic, Protocol, TYPE_CHECKING
 
 from ..models.character import Character
 from ..models.battle_team import BattleTeam
@@ -50,10 +49,9 @@ class SkillInfo:
     """技能信息"""
     pass
 
-class IBattleController(ABC):
-    """战斗控制器接口"""
+class IBattleController(Protocol):
+    """战斗控制器接口（结构化协议，实现类无需继承）"""
     
-    @abstractmethod
     def start_battle(self, team1: Optional['BattleTeam'] = None, team2: Optional['BattleTeam'] = None) -> Optional[Any]:
         """
         开始一场战斗
@@ -67,7 +65,6 @@ class IBattleController(ABC):
         """
         pass
     
-    @abstractmethod
     def get_available_actions(self, character_id: CharacterId) -> List[IAction]:
         """
         获取指定角色可用的行动
@@ -80,7 +77,6 @@ class IBattleController(ABC):
         """
         pass
         
-    @abstractmethod
     def execute_action(self, action: Any) -> Any:
         """
         执行一个行动并返回结果
@@ -93,7 +89,6 @@ class IBattleController(ABC):
         """
         pass
         
-    @abstractmethod
     def get_battle_state(self) -> IBattleState:
         """
         获取当前战斗状态
@@ -103,7 +98,6 @@ class IBattleController(ABC):
         """
         pass
         
-    @abstractmethod
     def is_battle_ended(self) -> bool:
         """
         检查战斗是否结束
@@ -113,10 +107,9 @@ class IBattleController(ABC):
         """
         pass
 
-class IBattleQuery(ABC):
-    """战斗查询接口"""
+class IBattleQuery(Protocol):
+    """战斗查询接口（结构化协议，实现类无需继承）"""
     
-    @abstractmethod
     def get_character_status(self, character_id: CharacterId) -> CharacterStatus:
         """
         获取角色状态
@@ -129,7 +122,6 @@ class IBattleQuery(ABC):
         """
         pass
         
-    @abstractmethod
     def get_team_status(self, team_id: TeamId) -> TeamStatus:
         """
         获取队伍状态
@@ -142,7 +134,6 @@ class IBattleQuery(ABC):
         """
         pass
         
-    @abstractmethod
     def get_skill_info(self, skill_id: SkillId) -> SkillInfo:
         """
         获取技能信息
@@ -155,7 +146,6 @@ class IBattleQuery(ABC):
         """
         pass
         
-    @abstractmethod
     def get_available_targets(self, skill_id: SkillId, caster_id: CharacterId) -> List[Target]:
         """
         获取技能可用目标列表
@@ -169,8 +159,18 @@ class IBattleQuery(ABC):
         """
         pass
 
-class IBattleEvents(ABC):
-    """战斗事件接口"""
+class IBattleEvents:
+    """战斗事件接口，作为普通基类为各事件提供空的默认实现"""
+    
+    # 是否需要动作结果中的文字消息，为False时控制器不再记录消息
+    wants_messages: bool = True
+    
+    # 各事件的订阅回调，每种事件单独保存，触发时直接遍历无需按事件名查找；
+    # 类属性为空元组，订阅时生成新元组赋给实例，子类无需在初始化时声明
+    _damage_subs: Tuple[Callable[[Dict[str, Any]], None], ...] = ()
+    _status_subs: Tuple[Callable[[Dict[str, Any]], None], ...] = ()
+    _turn_subs: Tuple[Callable[[Dict[str, Any]], None], ...] = ()
+    _chase_subs: Tuple[Callable[[Dict[str, Any]], None], ...] = ()
     
     # 测试用事件方法
     def on_battle_start(self, battle_state: Any) -> None:
@@ -209,7 +209,6 @@ class IBattleEvents(ABC):
         """状态效果移除事件"""
         pass
     
-    @abstractmethod
     def subscribe_damage_event(self, callback: Callable[[Dict[str, Any]], None]) -> None:
         """
         订阅伤害事件
@@ -217,9 +216,8 @@ class IBattleEvents(ABC):
         Args:
             callback: 事件回调函数，接收事件数据字典
         """
-        pass
+        self._damage_subs = self._damage_subs + (callback,)
         
-    @abstractmethod
     def subscribe_status_change_event(self, callback: Callable[[Dict[str, Any]], None]) -> None:
         """
         订阅状态变化事件
@@ -227,9 +225,8 @@ class IBattleEvents(ABC):
         Args:
             callback: 事件回调函数，接收事件数据字典
         """
-        pass
+        self._status_subs = self._status_subs + (callback,)
         
-    @abstractmethod
     def subscribe_turn_change_event(self, callback: Callable[[Dict[str, Any]], None]) -> None:
         """
         订阅回合变化事件
@@ -237,9 +234,8 @@ class IBattleEvents(ABC):
         Args:
             callback: 事件回调函数，接收事件数据字典
         """
-        pass
+        self._turn_subs = self._turn_subs + (callback,)
         
-    @abstractmethod
     def subscribe_chase_trigger_event(self, callback: Callable[[Dict[str, Any]], None]) -> None:
         """
         订阅追打触发事件
@@ -247,12 +243,51 @@ class IBattleEvents(ABC):
         Args:
             callback: 事件回调函数，接收事件数据字典
         """
-        pass
+        self._chase_subs = self._chase_subs + (callback,)
+        
+    def fire_damage_event(self, data: Dict[str, Any]) -> None:
+        """
+        触发伤害事件
+        
+        Args:
+            data: 事件数据字典
+        """
+        for callback in self._damage_subs:
+            callback(data)
+        
+    def fire_status_change_event(self, data: Dict[str, Any]) -> None:
+        """
+        触发状态变化事件
+        
+        Args:
+            data: 事件数据字典
+        """
+        for callback in self._status_subs:
+            callback(data)
+        
+    def fire_turn_change_event(self, data: Dict[str, Any]) -> None:
+        """
+        触发回合变化事件
+        
+        Args:
+            data: 事件数据字典
+        """
+        for callback in self._turn_subs:
+            callback(data)
+        
+    def fire_chase_trigger_event(self, data: Dict[str, Any]) -> None:
+        """
+        触发追打触发事件
+        
+        Args:
+            data: 事件数据字典
+        """
+        for callback in self._chase_subs:
+            callback(data)
 
-class IRepository(Generic[T]):
-    """仓库接口"""
+class IRepository(Protocol[T]):
+    """仓库接口（结构化协议，实现类无需继承）"""
     
-    @abstractmethod
     def get(self, id: str) -> Optional[T]:
         """
         获取实体
@@ -265,7 +300,6 @@ class IRepository(Generic[T]):
         """
         pass
     
-    @abstractmethod
     def add(self, entity: T) -> None:
         """
         添加实体
@@ -275,7 +309,6 @@ class IRepository(Generic[T]):
         """
         pass
     
-    @abstractmethod
     def update(self, entity: T) -> None:
         """
         更新实体
@@ -285,7 +318,6 @@ class IRepository(Generic[T]):
         """
         pass
     
-    @abstractmethod
     def remove(self, id: str) -> bool:
         """
         删除实体
@@ -298,7 +330,6 @@ class IRepository(Generic[T]):
         """
         pass
     
-    @abstractmethod
     def get_all(self) -> List[T]:
         """
         获取所有实体
@@ -306,4 +337,13 @@ class IRepository(Generic[T]):
         Returns:
             所有实体的列表
         """
+        pass
+    
+    def iter_all(self) -> Iterable[T]:
+        """
+        遍历所有实体，不复制实体列表
+        
+        Returns:
+            所有实体的可迭代视图
+        """
         pass 
\ No newline at end of file
@@ -2,42 +2,84 @@
 战斗行动数据模型
 定义了游戏中行动和行动结果的属性和行为
 """
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, InitVar
+from operator import methodcaller
 from typing import List, Dict, Any, Optional
 from enum import Enum
 
 from .character import Character
+from .battle_team import BattleTeam
 from .enums import ActionType as EnumActionType
+from ..utils.json_codec import json_dumps
+
+# 批量转换细节列表时使用的C实现调用器，配合map避免逐项调用绑定方法
+_TO_DICT = methodcaller('to_dict')
 
 # 测试用的Action类，简化版
-@dataclass
+@dataclass(slots=True)
 class Action:
     """战斗行动数据模型 - 测试用简化版"""
     character: Character                # 执行角色
     action_type: EnumActionType         # 行动类型
     target: Optional[Character] = None  # 目标角色
     skill: Optional[Any] = None         # 使用的技能
+    enemy_team: Optional[BattleTeam] = field(default=None, repr=False, compare=False)  # 执行期间缓存的敌方队伍
     
     def to_dict(self) -> Dict[str, Any]:
         """将行动转换为字典形式"""
+        # 枚举成员名直接读取_name_，绕过Enum.name属性描述符
         return {
             "character": self.character.name if self.character else None,
-            "action_type": self.action_type.name if self.action_type else None,
+            "action_type": self.action_type._name_ if self.action_type else None,
             "target": self.target.name if self.target else None,
             "skill": self.skill.name if self.skill and hasattr(self.skill, 'name') else None
         }
 
 # 测试用的ActionResult类，简化版
-@dataclass
+@dataclass(slots=True)
 class ActionResult:
     """战斗行动结果数据模型 - 测试用简化版"""
     action: Action                      # 执行的行动
     success: bool = True                # 行动是否成功
-    messages: List[str] = field(default_factory=list)  # 结果消息列表
+    messages: InitVar[Optional[List[str]]] = None  # 初始的结果消息列表
+    record_messages: bool = True        # 是否记录结果消息，无人读取时可关闭
+    _messages: List[str] = field(default_factory=list, init=False, repr=False)       # 已格式化的消息
+    _message_parts: List[tuple] = field(default_factory=list, init=False, repr=False)  # 未格式化的(格式串, 参数)列表
     
-    def add_message(self, message: str) -> None:
-        """添加结果消息"""
-        self.messages.append(message)
+    def __post_init__(self, messages: Optional[List[str]]):
+        """使用传入的初始消息列表"""
+        if messages is not None:
+            self._messages = messages
+    
+    def add_message(self, fmt: str, *args: Any) -> None:
+        """
+        添加结果消息
+        
+        Args:
+            fmt: 消息格式串，使用{}占位
+            *args: 格式化参数
+        """
+        if self.record_messages:
+            self._message_parts.append((fmt, args))
+
+
+def _get_messages(self: ActionResult) -> List[str]:
+    """结果消息列表，读取时才格式化尚未格式化的消息；返回的列表可直接修改"""
+    parts = self._message_parts
+    if parts:
+        self._messages.extend(fmt.format(*args) if args else fmt for fmt, args in parts)
+        parts.clear()
+    return self._messages
+
+
+def _set_messages(self: ActionResult, messages: List[str]) -> None:
+    """替换结果消息列表"""
+    self._messages = messages
+    self._message_parts.clear()
+
+
+# messages需要作为初始化参数，因此在类创建后再定义为属性
+ActionResult.messages = property(_get_messages, _set_messages)
 
 # 原始的ActionType枚举
 class OriginalActionType(Enum):
@@ -48,7 +90,7 @@ class OriginalActionType(Enum):
     PASS = "PASS"                    # 跳过行动
 
 # 原始的Action类
-@dataclass
+@dataclass(slots=True)
 class OriginalAction:
     """战斗行动数据模型 - 原始版本"""
     type: OriginalActionType             # 行动类型
@@ -59,13 +101,13 @@ class OriginalAction:
     def to_dict(self) -> Dict[str, Any]:
         """将行动转换为字典形式"""
         return {
-            "type": self.type.value,
+            "type": self.type._value_,
             "character_id": self.character_id,
             "skill_id": self.skill_id,
             "target_ids": self.target_ids
         }
 
-@dataclass
+@dataclass(slots=True)
 class DamageDetail:
     """伤害细节"""
     target_id: str           # 目标ID
@@ -80,7 +122,7 @@ class DamageDetail:
             "is_critical": self.is_critical
         }
 
-@dataclass
+@dataclass(slots=True)
 class HealingDetail:
     """治疗细节"""
     target_id: str           # 目标ID
@@ -93,7 +135,7 @@ class HealingDetail:
             "heal_amount": self.heal_amount
         }
 
-@dataclass
+@dataclass(slots=True)
 class StatusChangeDetail:
     """状态变化细节"""
     status_id: str               # 状态ID
@@ -112,7 +154,7 @@ class StatusChangeDetail:
             "stacks": self.stacks
         }
 
-@dataclass
+@dataclass(slots=True)
 class ChakraChangeDetail:
     """查克拉变化细节"""
     team_id: str             # 队伍ID
@@ -125,7 +167,7 @@ class ChakraChangeDetail:
             "change_amount": self.change_amount
         }
 
-@dataclass
+@dataclass(slots=True)
 class ChaseDetail:
     """追打细节"""
     character_id: str          # 追打角色ID
@@ -144,30 +186,62 @@ class ChaseDetail:
             "combo_count": self.combo_count
         }
 
-@dataclass
+@dataclass(slots=True)
 class OriginalActionResult:
     """战斗行动结果数据模型 - 原始版本"""
     action: OriginalAction                                # 执行的行动
     success: bool = True                                # 行动是否成功
-    damage_details: List[DamageDetail] = field(default_factory=list)  # 伤害细节列表
-    healing_details: List[HealingDetail] = field(default_factory=list)  # 治疗细节列表
     status_changes: List[StatusChangeDetail] = field(default_factory=list)  # 状态变化列表
-    chakra_changes: List[ChakraChangeDetail] = field(default_factory=list)  # 查克拉变化列表
     chase_details: List[ChaseDetail] = field(default_factory=list)  # 追打细节列表
     messages: List[str] = field(default_factory=list)   # 结果消息列表
     
+    # 伤害、治疗和查克拉变化细节按字段分列存储，追加时无需为每条细节创建对象
+    _damage_targets: List[str] = field(default_factory=list, init=False, repr=False)
+    _damage_amounts: List[int] = field(default_factory=list, init=False, repr=False)
+    _damage_crits: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    _healing_targets: List[str] = field(default_factory=list, init=False, repr=False)
+    _healing_amounts: List[int] = field(default_factory=list, init=False, repr=False)
+    _chakra_teams: List[str] = field(default_factory=list, init=False, repr=False)
+    _chakra_amounts: List[int] = field(default_factory=list, init=False, repr=False)
+    
+    @property
+    def damage_details(self) -> List[DamageDetail]:
+        """伤害细节列表，读取时由分列数据生成"""
+        return [DamageDetail(target, amount, bool(crit)) for target, amount, crit
+                in zip(self._damage_targets, self._damage_amounts, self._damage_crits)]
+        
+    @property
+    def healing_details(self) -> List[HealingDetail]:
+        """治疗细节列表，读取时由分列数据生成"""
+        return [HealingDetail(target, amount) for target, amount
+                in zip(self._healing_targets, self._healing_amounts)]
+        
+    @property
+    def chakra_changes(self) -> List[ChakraChangeDetail]:
+        """查克拉变化细节列表，读取时由分列数据生成"""
+        return [ChakraChangeDetail(team, amount) for team, amount
+                in zip(self._chakra_teams, self._chakra_amounts)]
+    
     def to_dict(self) -> Dict[str, Any]:
         """将行动结果转换为字典形式"""
         return {
             "action": self.action.to_dict(),
             "success": self.success,
-            "damage_details": [d.to_dict() for d in self.damage_details],
-            "healing_details": [h.to_dict() for h in self.healing_details],
-            "status_changes": [s.to_dict() for s in self.status_changes],
-            "chakra_changes": [c.to_dict() for c in self.chakra_changes],
-            "chase_details": [c.to_dict() for c in self.chase_details],
+            "damage_details": [{"target_id": target, "damage_amount": amount, "is_critical": bool(crit)}
+                               for target, amount, crit
+                               in zip(self._damage_targets, self._damage_amounts, self._damage_crits)],
+            "healing_details": [{"target_id": target, "heal_amount": amount}
+                                for target, amount in zip(self._healing_targets, self._healing_amounts)],
+            "status_changes": list(map(_TO_DICT, self.status_changes)),
+            "chakra_changes": [{"team_id": team, "change_amount": amount}
+                               for team, amount in zip(self._chakra_teams, self._chakra_amounts)],
+            "chase_details": list(map(_TO_DICT, self.chase_details)),
             "messages": self.messages
         }
+    
+    def to_json_bytes(self) -> bytes:
+        """将行动结果序列化为紧凑的JSON字节串"""
+        return json_dumps(self.to_dict(), indent=False)
         
     def add_message(self, message: str) -> None:
         """
@@ -187,11 +261,9 @@ class OriginalActionResult:
             damage: 伤害数值
             is_critical: 是否暴击
         """
-        self.damage_details.append(DamageDetail(
-            target_id=target_id,
-            damage_amount=damage,
-            is_critical=is_critical
-        ))
+        self._damage_targets.append(target_id)
+        self._damage_amounts.append(damage)
+        self._damage_crits.append(is_critical)
         
     def add_healing(self, target_id: str, heal_amount: int) -> None:
         """
@@ -201,10 +273,8 @@ class OriginalActionResult:
             target_id: 目标ID
             heal_amount: 治疗数值
         """
-        self.healing_details.append(HealingDetail(
-            target_id=target_id,
-            heal_amount=heal_amount
-        ))
+        self._healing_targets.append(target_id)
+        self._healing_amounts.append(heal_amount)
         
     def add_status_change(self, status_id: str, target_id: str, 
                          source_id: str, is_applied: bool = True, stacks: int = 1) -> None:
@@ -218,13 +288,8 @@ class OriginalActionResult:
             is_applied: 是否添加状态
             stacks: 层数
         """
-        self.status_changes.append(StatusChangeDetail(
-            status_id=status_id,
-            target_id=target_id,
-            source_id=source_id,
-            is_applied=is_applied,
-            stacks=stacks
-        ))
+        # 按位置传参构造，省去关键字参数的匹配开销
+        self.status_changes.append(StatusChangeDetail(status_id, target_id, source_id, is_applied, stacks))
         
     def add_chakra_change(self, team_id: str, change_amount: int) -> None:
         """
@@ -234,10 +299,8 @@ class OriginalActionResult:
             team_id: 队伍ID
             change_amount: 变化数值
         """
-        self.chakra_changes.append(ChakraChangeDetail(
-            team_id=team_id,
-            change_amount=change_amount
-        ))
+        self._chakra_teams.append(team_id)
+        self._chakra_amounts.append(change_amount)
         
     def add_chase(self, character_id: str, skill_id: str, 
                 target_id: str, chase_state: str, combo_count: int) -> None:
@@ -251,10 +314,5 @@ class OriginalActionResult:
             chase_state: 响应的状态
             combo_count: 当前连击数
         """
-        self.chase_details.append(ChaseDetail(
-            character_id=character_id,
-            skill_id=skill_id,
-            target_id=target_id,
-            chase_state=chase_state,
-            combo_count=combo_count
-        )) 
\ No newline at end of file
+        # 按位置传参构造，省去关键字参数的匹配开销
+        self.chase_details.append(ChaseDetail(character_id, skill_id, target_id, chase_state, combo_count)) 
\ No newline at end of file
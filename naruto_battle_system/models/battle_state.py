@@ -3,10 +3,12 @@
 定义了游戏中战斗状态和战斗会话的属性和行为
 """
 from dataclasses import dataclass, field
+from operator import attrgetter
 from typing import List, Dict, Any, Optional, Set, TYPE_CHECKING
 
 from ..interfaces.battle_interfaces import IBattleController, IBattleEvents
 from ..models.common_types import CharacterProtocol
+from ..utils.json_codec import json_dumps
 
 from .battle_team import BattleTeam
 from .character import Character
@@ -15,7 +17,10 @@ from .character import Character
 if TYPE_CHECKING:
     from ..controllers.input_controller import InputController
 
-@dataclass
+# 批量取角色ID时使用的C实现取值器，配合map避免逐个属性查找
+_CHARACTER_ID = attrgetter('id')
+
+@dataclass(slots=True)
 class BattleState:
     """战斗状态数据模型，用于向外部提供当前战斗状态"""
     # 为了兼容测试，允许通过team_a和team_b直接初始化
@@ -48,21 +53,89 @@ class BattleState:
     is_battle_ended: bool = False          # 战斗是否结束
     winner_team_id: Optional[str] = None   # 获胜队伍ID
     
+    # 角色所属队伍索引，键为id(角色)
+    _team_of: Dict[int, BattleTeam] = field(default_factory=dict, init=False, repr=False)
+    # 双方全部角色的扁平列表，以及按队伍存活版本号缓存的存活角色列表
+    _all_characters: List[Character] = field(default_factory=list, init=False, repr=False, compare=False)
+    _alive_characters: List[Character] = field(default_factory=list, init=False, repr=False, compare=False)
+    _alive_key: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    # 上次to_dict的结果及其对应的字段值
+    _dict_key: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    # 上次to_json_bytes序列化的字典及其结果
+    _json_source: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    _json_cache: bytes = field(default=b"", init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         """初始化后的处理，确保兼容测试"""
         # 如果使用了测试方式初始化（提供了team_a和team_b）
         if self.team_a and self.team_b:
             # 设置队伍ID
-            self.team1_id = self.team_a.player_id if hasattr(self.team_a, 'player_id') else "team_a"
-            self.team2_id = self.team_b.player_id if hasattr(self.team_b, 'player_id') else "team_b"
+            self.team1_id = self.team_a.player_id
+            self.team2_id = self.team_b.player_id
             
             # 设置队伍查克拉
-            self.team1_chakra = self.team_a.shared_chakra if hasattr(self.team_a, 'shared_chakra') else 0
-            self.team2_chakra = self.team_b.shared_chakra if hasattr(self.team_b, 'shared_chakra') else 0
+            self.team1_chakra = self.team_a.shared_chakra
+            self.team2_chakra = self.team_b.shared_chakra
+            
+            # 设置存活角色，直接使用队伍随阵亡/复活维护的存活列表，无需重新扫描
+            self.alive_characters_team1 = list(map(_CHARACTER_ID, self.team_a.alive_characters))
+            self.alive_characters_team2 = list(map(_CHARACTER_ID, self.team_b.alive_characters))
+            
+            # 预先建立角色到队伍的索引，避免每次线性查找
+            for team in (self.team_a, self.team_b):
+                for character in team.characters:
+                    self._team_of[id(character)] = team
+            self._all_characters = self.team_a.characters + self.team_b.characters
+    
+    def get_character_team(self, character: Character) -> Optional[BattleTeam]:
+        """
+        获取角色所属队伍
+        
+        Args:
+            character: 角色对象
+            
+        Returns:
+            角色所属队伍，未登记的角色视为队伍B
+        """
+        return self._team_of.get(id(character), self.team_b)
+        
+    def get_opponent_team(self, team: BattleTeam) -> Optional[BattleTeam]:
+        """
+        获取对手队伍
+        
+        Args:
+            team: 当前队伍
             
-            # 设置存活角色
-            self.alive_characters_team1 = [c.id for c in self.team_a.characters if c.is_alive] if hasattr(self.team_a, 'characters') else []
-            self.alive_characters_team2 = [c.id for c in self.team_b.characters if c.is_alive] if hasattr(self.team_b, 'characters') else []
+        Returns:
+            对手队伍
+        """
+        return self.team_b if team is self.team_a else self.team_a
+        
+    def get_all_characters(self) -> List[Character]:
+        """
+        获取双方全部角色
+        
+        Returns:
+            按队伍A、队伍B顺序排列的角色列表
+        """
+        return self._all_characters
+        
+    def get_alive_characters(self) -> List[Character]:
+        """
+        获取双方存活角色，仅在有角色阵亡或复活后重新构建
+        
+        返回的列表是调用时的快照，遍历期间有角色阵亡时列表不会更新，
+        遍历中可能造成阵亡的调用方需要自行检查is_alive
+        
+        Returns:
+            按队伍A、队伍B顺序排列的存活角色列表
+        """
+        key = (self.team_a.alive_version, self.team_b.alive_version)
+        if key != self._alive_key:
+            self._alive_characters = [c for c in self._all_characters if c.is_alive]
+            self._alive_key = key
+        return self._alive_characters
     
     def reset_round_data(self):
         """重置回合数据（测试用）"""
@@ -70,8 +143,15 @@ class BattleState:
         pass
     
     def to_dict(self) -> Dict[str, Any]:
-        """将战斗状态转换为字典形式"""
-        return {
+        """将战斗状态转换为字典形式，字段未变化时直接返回缓存，调用方不应修改返回的字典"""
+        key = (self.current_turn, self.acting_team_id, self.acting_character_id, self.next_character_id,
+               self.team1_id, self.team2_id, self.team1_chakra, self.team2_chakra, self.phase,
+               tuple(self.alive_characters_team1), tuple(self.alive_characters_team2), self.chase_combo_count,
+               self.is_battle_ended, self.winner_team_id)
+        if key == self._dict_key:
+            return self._dict_cache
+        self._dict_key = key
+        self._dict_cache = {
             "current_turn": self.current_turn,
             "acting_team_id": self.acting_team_id,
             "acting_character_id": self.acting_character_id,
@@ -87,11 +167,32 @@ class BattleState:
             "is_battle_ended": self.is_battle_ended,
             "winner_team_id": self.winner_team_id
         }
+        return self._dict_cache
+    
+    def to_json_bytes(self) -> bytes:
+        """将战斗状态序列化为紧凑的JSON字节串，状态未变化时直接返回缓存"""
+        data = self.to_dict()
+        # to_dict命中缓存时返回同一字典对象，此时无需重新序列化
+        if data is not self._json_source:
+            self._json_cache = json_dumps(data, indent=False)
+            self._json_source = data
+        return self._json_cache
+
+def _team_snapshot(team: Optional[BattleTeam], all_characters: Dict[str, CharacterProtocol]) -> tuple:
+    """获取队伍的(队伍ID, 查克拉, 存活角色ID列表)，队伍尚未设置时返回默认值"""
+    if team is None:
+        return "", 0, []
+    return team.player_id, team.shared_chakra, team.get_alive_characters(all_characters)
 
 # 使用标准类而非dataclass避免__init__与字段定义冲突
 class BattleSession:
     """战斗会话数据模型，维护一场战斗的所有状态"""
-    def __init__(self, battle_id: str, battle_state: BattleState, battle_controller: IBattleController, input_controller: "InputController", battle_view: IBattleEvents):
+    __slots__ = ('battle_id', 'battle_state', 'battle_controller', 'input_controller', 'battle_view',
+                 'team1', 'team2', 'current_turn', 'turn_order', 'current_actor_index', 'acting_team_id',
+                 'battle_ended', 'winner_team_id', 'chase_sequence', 'chase_target_id', 'chase_combo_count',
+                 'phase')
+    
+    def __init__(self, battle_id: int, battle_state: BattleState, battle_controller: IBattleController, input_controller: "InputController", battle_view: IBattleEvents):
         self.battle_id = battle_id
         self.battle_state = battle_state
         self.battle_controller = battle_controller
@@ -145,9 +246,9 @@ class BattleSession:
         Returns:
             角色所属队伍，如果找不到则为None
         """
-        if hasattr(self.team1, 'character_ids') and character_id in self.team1.character_ids:
+        if self.team1 is not None and character_id in self.team1.character_ids:
             return self.team1
-        if hasattr(self.team2, 'character_ids') and character_id in self.team2.character_ids:
+        if self.team2 is not None and character_id in self.team2.character_ids:
             return self.team2
         return None
         
@@ -173,18 +274,21 @@ class BattleSession:
         Returns:
             战斗状态对象
         """
+        # 每个队伍只判断一次是否已设置
+        team1_id, team1_chakra, alive_team1 = _team_snapshot(self.team1, all_characters)
+        team2_id, team2_chakra, alive_team2 = _team_snapshot(self.team2, all_characters)
         return BattleState(
             current_turn=self.current_turn,
             acting_team_id=self.acting_team_id or "",
             acting_character_id=self.get_current_actor_id(),
             next_character_id=self.get_next_actor_id(),
-            team1_id=self.team1.player_id if hasattr(self.team1, 'player_id') else "",
-            team2_id=self.team2.player_id if hasattr(self.team2, 'player_id') else "",
-            team1_chakra=self.team1.shared_chakra if hasattr(self.team1, 'shared_chakra') else 0,
-            team2_chakra=self.team2.shared_chakra if hasattr(self.team2, 'shared_chakra') else 0,
+            team1_id=team1_id,
+            team2_id=team2_id,
+            team1_chakra=team1_chakra,
+            team2_chakra=team2_chakra,
             phase=self.phase,
-            alive_characters_team1=self.team1.get_alive_characters(all_characters) if hasattr(self.team1, 'get_alive_characters') else [],
-            alive_characters_team2=self.team2.get_alive_characters(all_characters) if hasattr(self.team2, 'get_alive_characters') else [],
+            alive_characters_team1=alive_team1,
+            alive_characters_team2=alive_team2,
             chase_combo_count=self.chase_combo_count,
             is_battle_ended=self.battle_ended,
             winner_team_id=self.winner_team_id
@@ -3,11 +3,16 @@
 定义了游戏中队伍的属性和行为
 """
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from operator import attrgetter
+from typing import List, Dict, Any, Optional, FrozenSet, Set
 
 from .character import Character
+from ..utils.json_codec import json_dumps
 
-@dataclass
+# 批量取角色ID时使用的C实现取值器，配合map避免逐个属性查找
+_CHARACTER_ID = attrgetter('id')
+
+@dataclass(slots=True)
 class BattleTeam:
     """战斗小队数据模型"""
     name: str
@@ -17,14 +22,56 @@ class BattleTeam:
     shared_chakra: int = 0              # 小队当前共享查克拉总量
     max_chakra: int = 100               # 小队查克拉上限 (通常为100)
     chakra_per_turn: int = 20           # 每回合自动回复的查克拉 (通常为20)
-    team_buffs: List[str] = field(default_factory=list)  # 队伍级别的Buff ID列表 (如结界)
+    team_buffs: Set[str] = field(default_factory=set)  # 队伍级别的Buff ID集合 (如结界)
+    alive_count: int = field(default=0, init=False, compare=False)  # 存活角色数量，随角色阵亡/复活更新
+    alive_version: int = field(default=0, init=False, compare=False)  # 存活状态版本号，每次阵亡/复活递增
+    alive_characters: List[Character] = field(default_factory=list, init=False, repr=False, compare=False)  # 存活角色列表（只读），随角色阵亡/复活更新
+    # 队伍成员的id集合，用于按身份快速判断成员关系（角色数据类按字段比较且不可哈希）
+    _member_ids: FrozenSet[int] = field(default_factory=frozenset, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """初始化后的处理，确保兼容测试"""
         # 如果提供了characters列表但没有character_ids，则生成character_ids
         if self.characters and not self.character_ids:
-            self.character_ids = [c.id for c in self.characters if hasattr(c, 'id')]
+            self.character_ids = list(map(_CHARACTER_ID, self.characters))
+            
+        # 登记角色所属队伍，以便角色存活状态变化时更新计数
+        for character in self.characters:
+            character._team = self
+        self._member_ids = frozenset(id(c) for c in self.characters)
+        self.alive_characters = [c for c in self.characters if c.is_alive]
+        self.alive_count = len(self.alive_characters)
+        
+    def on_character_alive_changed(self, character: Character, is_alive: bool) -> None:
+        """
+        角色存活状态变化回调
+        
+        Args:
+            character: 状态变化的角色
+            is_alive: 变化后是否存活
+        """
+        self.alive_count += 1 if is_alive else -1
+        self.alive_version += 1
+        
+        if is_alive:
+            # 复活时按队伍中的原始顺序重建
+            self.alive_characters = [c for c in self.characters if c.is_alive]
+        elif self.has_character(character):
+            # 按身份移除，避免数据类按字段比较误删属性相同的其他角色
+            self.alive_characters = [c for c in self.alive_characters if c is not character]
     
+    def has_character(self, character: Character) -> bool:
+        """
+        判断角色是否属于本队伍
+        
+        Args:
+            character: 角色对象
+            
+        Returns:
+            如果角色在队伍中则为True，否则为False
+        """
+        return id(character) in self._member_ids
+        
     def add_chakra(self, amount: int) -> int:
         """
         增加队伍查克拉
@@ -69,13 +116,15 @@ class BattleTeam:
         """
         # 测试兼容：如果提供了characters列表，直接使用它
         if self.characters:
-            return all(not c.is_alive for c in self.characters)
+            return self.alive_count == 0
             
         # 原始实现
         if all_characters:
+            # 显式循环在小队规模下比any()加生成器更快；直接读取存活状态字段，绕过属性
+            get = all_characters.get
             for char_id in self.character_ids:
-                character = all_characters.get(char_id)
-                if character and character.is_alive:
+                character = get(char_id)
+                if character is not None and character._is_alive:
                     return False
             return True
         return False
@@ -92,12 +141,14 @@ class BattleTeam:
         """
         # 测试兼容：如果提供了characters列表，直接使用它
         if self.characters:
-            return [c.id for c in self.characters if c.is_alive and hasattr(c, 'id')]
+            return list(map(_CHARACTER_ID, self.alive_characters))
             
         # 原始实现
         if all_characters:
-            return [char_id for char_id in self.character_ids 
-                    if char_id in all_characters and all_characters[char_id].is_alive]
+            # 每个ID只查找一次字典
+            get = all_characters.get
+            return [char_id for char_id in self.character_ids
+                    if (character := get(char_id)) is not None and character._is_alive]
         return []
     
     def add_team_buff(self, buff_id: str) -> None:
@@ -107,8 +158,7 @@ class BattleTeam:
         Args:
             buff_id: 要添加的BuffID
         """
-        if buff_id not in self.team_buffs:
-            self.team_buffs.append(buff_id)
+        self.team_buffs.add(buff_id)
             
     def remove_team_buff(self, buff_id: str) -> bool:
         """
@@ -144,5 +194,9 @@ class BattleTeam:
             "character_ids": self.character_ids,
             "chakra": f"{self.shared_chakra}/{self.max_chakra}",
             "chakra_per_turn": self.chakra_per_turn,
-            "team_buffs": self.team_buffs
-        } 
\ No newline at end of file
+            "team_buffs": sorted(self.team_buffs)  # 排序以保证输出稳定
+        }
+        
+    def to_json_bytes(self) -> bytes:
+        """将队伍序列化为紧凑的JSON字节串"""
+        return json_dumps(self.to_dict(), indent=False) 
\ No newline at end of file
@@ -3,17 +3,18 @@
 定义了游戏中角色的所有属性和状态
 """
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Set, Union
-from .enums import ChaseState
+from operator import attrgetter
+from typing import Any, List, Dict, Optional, Set, Union
+from .enums import ChaseState, SkillType, AOE_TARGET_TYPES, DISABLING_EFFECT_TYPES
 from ..utils.logger import game_logger
 
-@dataclass
+@dataclass(slots=True)
 class Character:
     """角色数据模型"""
     name: str                    # 角色名称
     
     # 基本属性
-    hp: int = 0                  # 当前生命值，兼容测试用例
+    hp: int = 0                  # 当前生命值，为0时初始化为满血
     max_hp: int = 100            # 最大生命值
     chakra: int = 0              # 当前查克拉
     max_chakra: int = 100        # 最大查克拉
@@ -41,10 +42,13 @@ class Character:
     status_effects: List[any] = field(default_factory=list)  # 用于测试的状态效果列表
     current_buffs: List[str] = field(default_factory=list)   # 当前生效的Buff ID列表
     current_debuffs: List[str] = field(default_factory=list) # 当前生效的Debuff ID列表
-    current_states: Set[ChaseState] = field(default_factory=set)  # 当前角色处于的追打状态
+    current_states_mask: int = 0  # 当前角色处于的追打状态，按ChaseState.mask位存储
     
     # 角色标签和状态
     tags: List[str] = field(default_factory=list)  # 角色标签
+    # 存活状态的实际存储和所属队伍，需在is_alive之前初始化
+    _is_alive: bool = field(default=True, init=False, repr=False, compare=False)
+    _team: Optional[Any] = field(default=None, init=False, repr=False, compare=False)
     is_alive: bool = True                          # 是否存活
     can_act: bool = True                           # 是否能行动
     summoner_id: Optional[str] = None              # 召唤者ID
@@ -52,24 +56,162 @@ class Character:
     chakra_regen: int = 10                         # 每回合恢复查克拉
     is_player_controlled: bool = False             # 是否由玩家控制
     
-    # 内部属性
-    current_hp: int = 0                           # 内部使用的当前生命值
+    # 技能分类缓存，技能列表变化时重建
+    _healing_skills: List[any] = field(default_factory=list, init=False, repr=False, compare=False)
+    _buff_skills: List[any] = field(default_factory=list, init=False, repr=False, compare=False)
+    _attack_skills: List[any] = field(default_factory=list, init=False, repr=False, compare=False)
+    _aoe_skills: List[any] = field(default_factory=list, init=False, repr=False, compare=False)
+    _indexed_skill_count: int = field(default=-1, init=False, repr=False, compare=False)
+    
+    # 当前生效的眩晕/冰冻类状态数量，大于0时无法行动；状态效果列表被外部直接修改时重新统计
+    _disable_count: int = field(default=0, init=False, repr=False, compare=False)
+    _counted_effect_count: int = field(default=0, init=False, repr=False, compare=False)
+    
+    # 状态显示行缓存，状态效果变化时递增版本号使缓存失效
+    _status_version: int = field(default=0, init=False, repr=False, compare=False)
+    _status_line_key: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    _status_line_cache: str = field(default="", init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """初始化后的处理，确保当前生命值不超过最大生命值"""
         game_logger.debug(f"Character.__post_init__ called for {self.name} (ID: {self.id})")
-        # 如果测试设置了hp，则把它作为current_hp
-        if self.hp > 0:
-            self.current_hp = self.hp
-        else:
-            self.current_hp = self.max_hp
-            self.hp = self.max_hp
-            
-        if self.current_hp > self.max_hp:
-            self.current_hp = self.max_hp
+        # 未设置生命值时视为满血，且不超过最大生命值
+        if self.hp <= 0 or self.hp > self.max_hp:
             self.hp = self.max_hp
+        self._rebuild_skill_index()
         game_logger.debug(f"Character {self.name} (ID: {self.id}) initialized. HP: {self.hp}, Max HP: {self.max_hp}, Alive: {self.is_alive}")
             
+    def add_skill(self, skill) -> None:
+        """
+        添加技能并更新技能分类缓存
+        
+        Args:
+            skill: 要添加的技能
+        """
+        self.skills.append(skill)
+        self._rebuild_skill_index()
+        
+    def add_status_effect(self, effect) -> None:
+        """
+        添加状态效果并更新无法行动计数
+        
+        Args:
+            effect: 要添加的状态效果
+        """
+        self._ensure_disable_count()
+        self.status_effects.append(effect)
+        if effect.effect_type in DISABLING_EFFECT_TYPES:
+            self._disable_count += 1
+        self._counted_effect_count = len(self.status_effects)
+        self.invalidate_status()
+            
+    def remove_status_effect(self, effect) -> None:
+        """
+        移除状态效果并更新无法行动计数
+        
+        Args:
+            effect: 要移除的状态效果
+        """
+        self._ensure_disable_count()
+        self.status_effects.remove(effect)
+        if effect.effect_type in DISABLING_EFFECT_TYPES:
+            self._disable_count -= 1
+        self._counted_effect_count = len(self.status_effects)
+        self.invalidate_status()
+        
+    def remove_status_effects(self, effects: List[Any]) -> None:
+        """
+        一次移除多个状态效果并更新无法行动计数
+        
+        Args:
+            effects: 要移除的状态效果列表
+        """
+        if not effects:
+            return
+        self._ensure_disable_count()
+        # 状态效果按实例区分，同值的不同实例不会被一并移除
+        removed_ids = {id(effect) for effect in effects}
+        self.status_effects = [effect for effect in self.status_effects if id(effect) not in removed_ids]
+        for effect in effects:
+            if effect.effect_type in DISABLING_EFFECT_TYPES:
+                self._disable_count -= 1
+        self._counted_effect_count = len(self.status_effects)
+        self.invalidate_status()
+        
+    def _ensure_disable_count(self) -> None:
+        """状态效果列表被外部直接修改时重新统计无法行动状态数量"""
+        if self._counted_effect_count != len(self.status_effects):
+            self._disable_count = sum(1 for effect in self.status_effects
+                                      if effect.effect_type in DISABLING_EFFECT_TYPES)
+            self._counted_effect_count = len(self.status_effects)
+        
+    def is_disabled(self) -> bool:
+        """
+        判断角色是否处于眩晕/冰冻等无法行动的状态
+        
+        Returns:
+            如果角色无法行动返回True
+        """
+        self._ensure_disable_count()
+        return self._disable_count > 0
+        
+    def invalidate_status(self) -> None:
+        """标记状态效果已变化（如持续时间被修改），下次显示时重新格式化状态行"""
+        self._status_version += 1
+        
+    def status_line(self) -> str:
+        """
+        获取角色的状态显示文本，属性和状态效果未变化时直接返回缓存
+        
+        Returns:
+            包含生命值、查克拉、存活状态及状态效果的文本
+        """
+        key = (self.hp, self.max_hp, self.chakra, self.max_chakra, self._is_alive,
+               self._status_version, len(self.status_effects))
+        if key != self._status_line_key:
+            status = "存活" if self._is_alive else "阵亡"
+            line = f"{self.name} - HP: {self.hp}/{self.max_hp} CP: {self.chakra}/{self.max_chakra} ({status})"
+            if self.status_effects:
+                # 直接将生成器交给join，不构建中间列表
+                effect_text = ', '.join("%s(%d回合)" % (effect.effect_type._name_, effect.duration) for effect in self.status_effects)
+                line += f"\n     状态: {effect_text}"
+            self._status_line_cache = line
+            self._status_line_key = key
+        return self._status_line_cache
+            
+    def _rebuild_skill_index(self) -> None:
+        """按技能类型和目标类型重建技能分类缓存"""
+        self._healing_skills = [s for s in self.skills if s.skill_type == SkillType.HEALING]
+        self._buff_skills = [s for s in self.skills if s.skill_type == SkillType.BUFF]
+        self._attack_skills = [s for s in self.skills if s.skill_type in (SkillType.DAMAGE, SkillType.DEBUFF)]
+        self._aoe_skills = [s for s in self.skills if s.target_type in AOE_TARGET_TYPES]
+        self._indexed_skill_count = len(self.skills)
+        
+    def _ensure_skill_index(self) -> None:
+        """技能列表被外部直接修改时重建缓存"""
+        if self._indexed_skill_count != len(self.skills):
+            self._rebuild_skill_index()
+            
+    def get_healing_skills(self) -> List[any]:
+        """获取治疗技能列表"""
+        self._ensure_skill_index()
+        return self._healing_skills
+        
+    def get_buff_skills(self) -> List[any]:
+        """获取增益技能列表"""
+        self._ensure_skill_index()
+        return self._buff_skills
+        
+    def get_attack_skills(self) -> List[any]:
+        """获取伤害和减益技能列表"""
+        self._ensure_skill_index()
+        return self._attack_skills
+        
+    def get_aoe_skills(self) -> List[any]:
+        """获取群体技能列表"""
+        self._ensure_skill_index()
+        return self._aoe_skills
+            
     def is_affected_by_chase_state(self, state: ChaseState) -> bool:
         """
         检查角色是否受到特定追打状态的影响
@@ -80,7 +222,7 @@ class Character:
         Returns:
             如果角色受到该状态影响则为True，否则为False
         """
-        return state in self.current_states
+        return bool(self.current_states_mask & state.mask)
         
     def add_chase_state(self, state: ChaseState) -> None:
         """
@@ -89,8 +231,8 @@ class Character:
         Args:
             state: 要添加的追打状态
         """
-        if state != ChaseState.NONE:
-            self.current_states.add(state)
+        # NONE的掩码为0，无需单独判断
+        self.current_states_mask |= state.mask
             
     def remove_chase_state(self, state: ChaseState) -> None:
         """
@@ -99,12 +241,17 @@ class Character:
         Args:
             state: 要移除的追打状态
         """
-        if state in self.current_states:
-            self.current_states.remove(state)
+        self.current_states_mask &= ~state.mask
             
     def clear_chase_states(self) -> None:
         """清除所有追打状态"""
-        self.current_states.clear()
+        self.current_states_mask = 0
+        
+    @property
+    def current_states(self) -> Set[ChaseState]:
+        """当前角色处于的追打状态集合，由位掩码生成"""
+        mask = self.current_states_mask
+        return {state for state in ChaseState if mask & state.mask}
         
     def take_damage(self, amount: int) -> int:
         """
@@ -116,20 +263,20 @@ class Character:
         Returns:
             实际受到的伤害值
         """
-        if not self.is_alive:
+        # 直接读取存储字段并在局部变量上运算，避免属性访问和min调用
+        if not self._is_alive:
             return 0
             
-        actual_damage = min(self.current_hp, amount)
-        self.current_hp -= actual_damage
-        self.hp = self.current_hp  # 同步更新hp属性
-        
-        if self.current_hp <= 0:
-            self.is_alive = False
-            self.current_hp = 0
+        hp = self.hp
+        if amount >= hp:
+            # 致命伤害，生命值归零并标记阵亡
             self.hp = 0
-            game_logger.debug(f"Character {self.name} (ID: {self.id}) is_alive changed to False in take_damage.")
+            self.is_alive = False
+            game_logger.debug("Character %s (ID: %s) is_alive changed to False in take_damage.", self.name, self.id)
+            return hp
             
-        return actual_damage
+        self.hp = hp - amount
+        return amount
         
     def heal(self, amount: int) -> int:
         """
@@ -141,13 +288,24 @@ class Character:
         Returns:
             实际恢复的生命值
         """
-        if not self.is_alive:
+        if not self._is_alive:
             return 0
             
-        old_hp = self.current_hp
-        self.current_hp = min(self.max_hp, self.current_hp + amount)
-        self.hp = self.current_hp  # 同步更新hp属性
-        return self.current_hp - old_hp
+        old_hp = self.hp
+        new_hp = old_hp + amount
+        if new_hp > self.max_hp:
+            new_hp = self.max_hp
+        self.hp = new_hp
+        return new_hp - old_hp
+        
+    @property
+    def current_hp(self) -> int:
+        """当前生命值，hp的别名，兼容旧的数据格式和调用方"""
+        return self.hp
+        
+    @current_hp.setter
+    def current_hp(self, value: int) -> None:
+        self.hp = value
         
     def can_use_skill(self, skill_id: str, team_chakra: int) -> bool:
         """
@@ -179,39 +337,43 @@ class Character:
     def clone(self) -> "Character":
         """
         克隆角色
+        
+        直接复制各槽位的值而不重新调用__init__，列表字段各自复制一份，
+        克隆体不属于任何队伍
         """
-        game_logger.debug(f"Cloning character: ID={self.id}, Name={self.name}, HP={self.hp}, MaxHP={self.max_hp}, Alive={self.is_alive}")
-        cloned_char = Character(
-            name=self.name,
-            hp=self.hp,
-            max_hp=self.max_hp,
-            chakra=self.chakra,
-            max_chakra=self.max_chakra,
-            attack=self.attack,
-            defense=self.defense,
-            speed=self.speed,
-            ninja_tech=self.ninja_tech,
-            resistance=self.resistance,
-            crit_rate=self.crit_rate,
-            crit_damage_bonus=self.crit_damage_bonus,
-            position=self.position,
-            skills=self.skills,
-            normal_attack_id=self.normal_attack_id,
-            mystery_art_id=self.mystery_art_id,
-            chase_skill_ids=self.chase_skill_ids,
-            passive_skill_ids=self.passive_skill_ids,
-            status_effects=self.status_effects,
-            current_buffs=self.current_buffs,
-            current_debuffs=self.current_debuffs,
-            current_states=self.current_states,
-            tags=self.tags,
-            is_alive=self.is_alive,
-            can_act=self.can_act,
-            summoner_id=self.summoner_id,
-            is_summon=self.is_summon,
-            chakra_regen=self.chakra_regen,
-            is_player_controlled=self.is_player_controlled,
-            current_hp=self.current_hp
-        )
-        game_logger.debug(f"Cloned character created: ID={cloned_char.id}, Name={cloned_char.name}, HP={cloned_char.hp}, MaxHP={cloned_char.max_hp}, Alive={cloned_char.is_alive}")
-        return cloned_char
\ No newline at end of file
+        game_logger.debug("Cloning character: ID=%s, Name=%s, HP=%s, MaxHP=%s, Alive=%s",
+                          self.id, self.name, self.hp, self.max_hp, self._is_alive)
+        cloned_char = Character.__new__(Character)
+        for slot, value in zip(_CLONE_SLOTS, _get_clone_slots(self)):
+            setattr(cloned_char, slot, value)
+        for slot, value in zip(_CLONE_LIST_SLOTS, _get_clone_list_slots(self)):
+            setattr(cloned_char, slot, list(value))
+        cloned_char._team = None
+        return cloned_char
+
+
+def _get_is_alive(self: Character) -> bool:
+    """是否存活"""
+    return self._is_alive
+
+
+def _set_is_alive(self: Character, value: bool) -> None:
+    """设置存活状态，状态变化时通知所属队伍更新存活计数"""
+    if value == self._is_alive:
+        return
+    self._is_alive = value
+    if self._team is not None:
+        self._team.on_character_alive_changed(self, value)
+
+
+# is_alive需要作为dataclass字段参与初始化，因此在类创建后再替换为属性
+# （同时覆盖了slots生成的同名描述符，实际值保存在_is_alive中）
+Character.is_alive = property(_get_is_alive, _set_is_alive)
+
+# clone时需要复制的槽位：列表字段单独复制，is_alive由_is_alive保存，所属队伍不复制
+_CLONE_LIST_SLOTS = ('skills', 'chase_skill_ids', 'passive_skill_ids', 'traits', 'status_effects',
+                     'current_buffs', 'current_debuffs', 'tags')
+_CLONE_SLOTS = tuple(slot for slot in Character.__slots__
+                     if slot not in _CLONE_LIST_SLOTS and slot not in ('is_alive', '_team'))
+_get_clone_slots = attrgetter(*_CLONE_SLOTS)
+_get_clone_list_slots = attrgetter(*_CLONE_LIST_SLOTS)
\ No newline at end of file
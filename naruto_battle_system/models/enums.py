@@ -2,10 +2,10 @@
 枚举类型定义
 包含战斗系统中使用的所有枚举类型
 """
-from enum import Enum, auto
+from enum import Enum, IntEnum, auto
 
-class ActionType(Enum):
-    """动作类型枚举"""
+class ActionType(IntEnum):
+    """动作类型枚举，整数值用作动作分派表的下标"""
     ATTACK = auto()   # 普通攻击
     SKILL = auto()    # 技能
     ITEM = auto()     # 使用道具
@@ -20,6 +20,8 @@ class SkillType(Enum):
     PASSIVE = auto()   # 被动技能
     DAMAGE = auto()    # 伤害技能（测试用）
     HEALING = auto()   # 治疗技能（测试用）
+    BUFF = auto()      # 增益技能
+    DEBUFF = auto()    # 减益技能
 
 class TargetType(Enum):
     """目标选择类型枚举"""
@@ -34,6 +36,9 @@ class TargetType(Enum):
     SINGLE_ALLY = auto()             # 单个友方
     ALL_ALLIES = auto()              # 友方全体
 
+# 群体攻击目标类型
+AOE_TARGET_TYPES = frozenset({TargetType.ALL_ENEMIES, TargetType.RANDOM_N_ENEMIES})
+
 class StatusEffectType(Enum):
     """状态效果类型枚举"""
     BUFF_ATK = auto()    # 攻击力提升
@@ -50,6 +55,9 @@ class StatusEffectType(Enum):
     REFLECT = auto()     # 伤害反弹
     IMMUNITY = auto()    # 状态免疫
 
+# 使角色无法行动的状态效果类型
+DISABLING_EFFECT_TYPES = frozenset({StatusEffectType.STUN, StatusEffectType.FREEZE})
+
 class EffectType(Enum):
     """效果类型枚举"""
     DAMAGE = auto()        # 造成伤害
@@ -71,6 +79,11 @@ class ChaseState(Enum):
     BIG_FLOAT = auto()  # 大浮空
     KNOCKDOWN = auto()  # 倒地
     REPEL = auto()      # 击退
+    
+    @property
+    def mask(self) -> int:
+        """该追打状态在角色状态位掩码中对应的位，NONE不占用任何位"""
+        return 0 if self is ChaseState.NONE else 1 << self.value
 
 class RemoveStatusType(Enum):
     """状态移除类型枚举"""
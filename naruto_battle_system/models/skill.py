@@ -3,10 +3,14 @@
 定义了游戏中技能和技能效果的所有属性
 """
 from dataclasses import dataclass, field
+from operator import methodcaller
 from typing import List, Optional, Dict, Any
-from .enums import SkillType, TargetType, EffectType, ChaseState, RemoveStatusType, StatusType
+from .enums import SkillType, TargetType, EffectType, ChaseState, RemoveStatusType, StatusType, AOE_TARGET_TYPES
 
-@dataclass
+# 批量转换效果列表时使用的C实现调用器
+_TO_DICT = methodcaller('to_dict')
+
+@dataclass(slots=True)
 class SkillEffect:
     """技能效果数据模型"""
     effect_type: EffectType                 # 效果类型
@@ -20,18 +24,19 @@ class SkillEffect:
     
     def to_dict(self) -> Dict[str, Any]:
         """将效果转换为字典形式"""
+        # 枚举成员名直接读取_name_，绕过Enum.name属性描述符
         return {
-            "effect_type": self.effect_type.name,
+            "effect_type": self.effect_type._name_,
             "value_formula": self.value_formula,
             "status_id_to_apply": self.status_id_to_apply,
             "apply_chance": self.apply_chance,
-            "remove_status_type": self.remove_status_type.name if self.remove_status_type else None,
+            "remove_status_type": self.remove_status_type._name_ if self.remove_status_type else None,
             "specific_status_id": self.specific_status_id,
             "chakra_change_amount": self.chakra_change_amount,
             "summon_character_id": self.summon_character_id
         }
 
-@dataclass
+@dataclass(slots=True)
 class DamageEffect:
     """伤害效果类，用于表示技能造成的伤害"""
     base_value: int                         # 基础伤害值
@@ -41,7 +46,7 @@ class DamageEffect:
         """根据攻击者攻击力计算最终伤害"""
         return self.base_value + (attacker_attack * self.scaling // 100)
 
-@dataclass
+@dataclass(slots=True)
 class HealingEffect:
     """治疗效果类，用于表示技能的治疗"""
     base_value: int                         # 基础治疗值
@@ -51,7 +56,11 @@ class HealingEffect:
         """根据施法者属性计算最终治疗量"""
         return self.base_value + (caster_stat * self.scaling // 100)
 
-@dataclass
+# 可序列化的效果类型，按类型判断即可，无需对每个效果调用hasattr
+# （DamageEffect和HealingEffect是测试用的简化效果，不参与序列化）
+_SERIALIZABLE_EFFECT_TYPES = frozenset({SkillEffect})
+
+@dataclass(slots=True)
 class Skill:
     """技能数据模型"""
     name: str                         # 技能名称
@@ -73,11 +82,66 @@ class Skill:
     is_interruptible: bool = True     # 是否可被打断
     is_instant: bool = False          # 是否瞬发
     
+    # 由效果列表推导的缓存标志，效果列表变化时重新计算
+    _power_rating: int = field(default=0, init=False, repr=False, compare=False)
+    _has_damage: bool = field(default=False, init=False, repr=False, compare=False)
+    _has_debuff: bool = field(default=False, init=False, repr=False, compare=False)
+    _is_aoe: bool = field(default=False, init=False, repr=False, compare=False)
+    _flags_effect_count: int = field(default=-1, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         """初始化后的处理"""
         # 兼容测试，如果设置了cost但没有设置chakra_cost
         if self.cost > 0 and self.chakra_cost == 0:
             self.chakra_cost = self.cost
+        self.finalize()
+            
+    def finalize(self) -> None:
+        """根据效果列表预先计算技能威力和效果标志"""
+        power_rating = 0
+        has_damage = False
+        for effect in self.effects:
+            if isinstance(effect, DamageEffect):
+                has_damage = True
+                power_rating += effect.base_value + effect.scaling
+            elif isinstance(effect, HealingEffect):
+                power_rating += effect.base_value + effect.scaling
+        self._power_rating = power_rating
+        self._has_damage = has_damage
+        # 目前没有独立的减益效果类，按技能类型判断
+        self._has_debuff = self.skill_type == SkillType.DEBUFF
+        self._is_aoe = self.target_type in AOE_TARGET_TYPES
+        self._flags_effect_count = len(self.effects)
+        
+    def _ensure_flags(self) -> None:
+        """效果列表被外部直接修改时重新计算标志"""
+        if self._flags_effect_count != len(self.effects):
+            self.finalize()
+            
+    def get_power_rating(self) -> int:
+        """
+        获取技能威力评分
+        
+        Returns:
+            各伤害与治疗效果的基础值与加成之和
+        """
+        self._ensure_flags()
+        return self._power_rating
+        
+    def has_damage_effect(self) -> bool:
+        """是否包含伤害效果"""
+        self._ensure_flags()
+        return self._has_damage
+        
+    def has_debuff_effect(self) -> bool:
+        """是否带有减益效果"""
+        self._ensure_flags()
+        return self._has_debuff
+        
+    def is_aoe(self) -> bool:
+        """是否为群体技能"""
+        self._ensure_flags()
+        return self._is_aoe
     
     def can_be_used(self, team_chakra: int) -> bool:
         """
@@ -94,7 +158,7 @@ class Skill:
             return False
             
         # 检查查克拉（仅对奥义）
-        if self.skill_type == SkillType.MYSTERY and self.chakra_cost > team_chakra:
+        if self.skill_type is SkillType.MYSTERY and self.chakra_cost > team_chakra:
             return False
             
         return True
@@ -109,7 +173,7 @@ class Skill:
         Returns:
             如果可以追打则为True，否则为False
         """
-        return self.skill_type == SkillType.CHASE and self.requires_chase_state == target_state
+        return self.skill_type is SkillType.CHASE and self.requires_chase_state is target_state
         
     def reduce_cooldown(self, amount: int = 1) -> None:
         """
@@ -130,15 +194,15 @@ class Skill:
         return {
             "id": self.id,
             "name": self.name,
-            "type": self.skill_type.name,
+            "type": self.skill_type._name_,
             "description": self.description,
             "chakra_cost": self.chakra_cost,
             "cooldown": f"{self.current_cooldown}/{self.cooldown_turns}",
-            "target_type": self.target_type.name,
+            "target_type": self.target_type._name_,
             "target_count": self.target_count,
-            "causes_chase_state": self.causes_chase_state.name,
-            "requires_chase_state": self.requires_chase_state.name,
+            "causes_chase_state": self.causes_chase_state._name_,
+            "requires_chase_state": self.requires_chase_state._name_,
             "is_interruptible": self.is_interruptible,
             "is_instant": self.is_instant,
-            "effects": [effect.to_dict() for effect in self.effects if hasattr(effect, 'to_dict')]
+            "effects": [_TO_DICT(effect) for effect in self.effects if type(effect) in _SERIALIZABLE_EFFECT_TYPES]
         } 
\ No newline at end of file
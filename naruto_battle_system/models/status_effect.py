@@ -6,7 +6,7 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 from .enums import StatusType, EffectType, StatusEffectType
 
-@dataclass
+@dataclass(slots=True)
 class StatusEffect:
     """状态效果数据模型 - 简化版，用于测试和战斗控制器"""
     name: str                        # 状态名称
@@ -19,17 +19,18 @@ class StatusEffect:
     
     def to_dict(self) -> Dict[str, Any]:
         """将状态效果转换为字典形式"""
+        # 枚举成员名直接读取_name_，绕过Enum.name属性描述符
         return {
             "name": self.name,
             "description": self.description,
-            "effect_type": self.effect_type.name,
+            "effect_type": self.effect_type._name_,
             "value": self.value,
             "duration": self.duration,
             "source_character_id": self.source_character_id,
             "is_buff": self.is_buff
         }
 
-@dataclass
+@dataclass(slots=True)
 class PeriodicEffect:
     """周期性效果"""
     effect_type: EffectType  # 效果类型
@@ -38,11 +39,11 @@ class PeriodicEffect:
     def to_dict(self) -> Dict[str, Any]:
         """将效果转换为字典形式"""
         return {
-            "effect_type": self.effect_type.name,
+            "effect_type": self.effect_type._name_,
             "value_formula": self.value_formula
         }
 
-@dataclass
+@dataclass(slots=True)
 class InstantEffect:
     """即时效果"""
     effect_type: EffectType  # 效果类型
@@ -51,16 +52,25 @@ class InstantEffect:
     def to_dict(self) -> Dict[str, Any]:
         """将效果转换为字典形式"""
         return {
-            "effect_type": self.effect_type.name,
+            "effect_type": self.effect_type._name_,
             "value_formula": self.value_formula
         }
 
-@dataclass
+@dataclass(slots=True)
 class StatModifier:
     """属性修改器"""
     stat_name: str       # 修改的属性名
     value: float         # 修改值
     is_percentage: bool  # 是百分比还是固定值
+    _mul: float = field(default=1, init=False, repr=False, compare=False)   # 预先计算的倍率
+    _flat: float = field(default=0, init=False, repr=False, compare=False)  # 预先计算的固定加值
+    
+    def __post_init__(self):
+        """预先计算倍率和固定加值，apply时无需再判断修改方式"""
+        if self.is_percentage:
+            self._mul = 1 + self.value / 100
+        else:
+            self._flat = self.value
     
     def to_dict(self) -> Dict[str, Any]:
         """将修改器转换为字典形式"""
@@ -80,12 +90,9 @@ class StatModifier:
         Returns:
             修改后的属性值
         """
-        if self.is_percentage:
-            return base_value * (1 + self.value / 100)
-        else:
-            return base_value + self.value
+        return base_value * self._mul + self._flat
 
-@dataclass
+@dataclass(slots=True)
 class StatusEffectDefinition:
     """状态效果定义数据模型"""
     id: str                          # 状态唯一ID
@@ -116,12 +123,44 @@ class StatusEffectDefinition:
     is_dispelled_by: List[str] = field(default_factory=list)     # 可被哪些特定效果驱散
     is_immunity_bypassed_by: List[str] = field(default_factory=list)  # 可绕过哪些免疫效果
     
+    # 按属性名合并后的修改器缓存: {属性名: (倍率, 固定加值)}，修改器列表长度变化时重建
+    _combined_modifiers: Dict[str, tuple] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _combined_modifier_count: int = field(default=-1, init=False, repr=False, compare=False)
+    
+    def _combine_modifiers(self) -> None:
+        """将同一属性的修改器按顺序合并为一次乘加运算"""
+        combined = {}
+        for modifier in self.modifiers:
+            mul, flat = combined.get(modifier.stat_name, (1, 0))
+            # (x * mul + flat) * m + f = x * (mul * m) + (flat * m + f)
+            combined[modifier.stat_name] = (mul * modifier._mul, flat * modifier._mul + modifier._flat)
+        self._combined_modifiers = combined
+        self._combined_modifier_count = len(self.modifiers)
+    
+    def apply_modifiers(self, stat_name: str, base_value: float) -> float:
+        """
+        依次应用该状态对指定属性的所有修改器
+        
+        Args:
+            stat_name: 属性名
+            base_value: 基础属性值
+            
+        Returns:
+            修改后的属性值
+        """
+        if self._combined_modifier_count != len(self.modifiers):
+            self._combine_modifiers()
+        combined = self._combined_modifiers.get(stat_name)
+        if combined is None:
+            return base_value
+        return base_value * combined[0] + combined[1]
+    
     def to_dict(self) -> Dict[str, Any]:
         """将状态效果定义转换为字典形式"""
         return {
             "id": self.id,
             "name": self.name,
-            "type": self.type.name,
+            "type": self.type._name_,
             "icon": self.icon,
             "description": self.description,
             "max_stacks": self.max_stacks,
@@ -133,7 +172,7 @@ class StatusEffectDefinition:
             "is_dispellable": self.is_dispellable
         }
 
-@dataclass
+@dataclass(slots=True)
 class ActiveStatusEffect:
     """激活的状态效果数据模型"""
     definition_id: str        # 对应StatusEffectDefinition的ID
@@ -1,4 +1,5 @@
-import uuid
+import itertools
+import logging
 import threading
 import time
 from typing import List, Dict, Optional, Callable, Any, TYPE_CHECKING
@@ -24,7 +25,12 @@ class BattleService:
             character_repository: 角色仓库实例
         """
         self.character_repository = character_repository
-        self.active_battles: Dict[str, BattleSession] = {}
+        self.active_battles: Dict[int, BattleSession] = {}
+        # 递增的战斗ID，比生成UUID字符串更轻量，作为字典键也无需逐字节计算哈希
+        self._battle_ids = itertools.count(1)
+        # 可用角色列表缓存及其对应的角色仓库版本号
+        self._available_cache: Optional[List[Dict[str, Any]]] = None
+        self._available_version = -1
     
     def create_battle(self, team_a_characters: List[Character], team_b_characters: List[Character], 
                      team_a_name: str = "玩家队伍", team_b_name: str = "敌方队伍") -> BattleSession:
@@ -59,7 +65,7 @@ class BattleService:
         )
         
         # 创建并保存战斗会话
-        battle_id = str(uuid.uuid4())
+        battle_id = next(self._battle_ids)
         battle_session = BattleSession(
             battle_id=battle_id,
             battle_state=battle_state,
@@ -71,7 +77,7 @@ class BattleService:
         self.active_battles[battle_id] = battle_session
         return battle_session
     
-    def start_battle(self, battle_id: str) -> None:
+    def start_battle(self, battle_id: int) -> None:
         """开始指定的战斗
         
         Args:
@@ -95,18 +101,29 @@ class BattleService:
         Args:
             session: 战斗会话
         """
-        game_logger.debug(f"_battle_loop: Initial check of is_battle_over() for session {session.battle_id}. Result: {session.battle_controller.is_battle_over()}")
-        while not session.battle_controller.is_battle_over():
-            current_round = session.battle_state.current_round
-            game_logger.debug(f"_battle_loop: Round {current_round} - About to call process_turn for session {session.battle_id}.")
+        battle_controller = session.battle_controller
+        battle_state = session.battle_state
+        battle_id = session.battle_id
+        # 调试日志需要额外调用is_battle_over()，仅在DEBUG级别启用时执行
+        debug = game_logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            game_logger.debug("_battle_loop: Initial check of is_battle_over() for session %s. Result: %s",
+                              battle_id, battle_controller.is_battle_over())
+        while not battle_controller.is_battle_over():
+            current_round = battle_state.current_round
+            if debug:
+                game_logger.debug("_battle_loop: Round %d - About to call process_turn for session %s.",
+                                  current_round, battle_id)
             # 处理当前角色的回合
-            is_battle_over_flag = session.battle_controller.process_turn()
-            game_logger.debug(f"_battle_loop: Round {current_round} - process_turn returned: {is_battle_over_flag}. Current is_battle_over(): {session.battle_controller.is_battle_over()}")
+            is_battle_over_flag = battle_controller.process_turn()
+            if debug:
+                game_logger.debug("_battle_loop: Round %d - process_turn returned: %s. Current is_battle_over(): %s",
+                                  current_round, is_battle_over_flag, battle_controller.is_battle_over())
             if is_battle_over_flag:
                 break
                 
             # 获取当前角色
-            current_character = session.battle_controller.get_current_character()
+            current_character = battle_controller.get_current_character()
             if not current_character:
                 continue
                 
@@ -130,6 +147,9 @@ class BattleService:
                 command = input().strip()
                 if session.input_controller.process_command(command, character):
                     break  # 指令处理成功，跳出循环
+            except EOFError:
+                # 输入已关闭，无法再读取指令，交由调用方处理而不是反复重试
+                raise
             except Exception as e:
                 print(f"错误: {str(e)}")
     
@@ -142,7 +162,7 @@ class BattleService:
         """
         battle_controller.execute_action(action)
     
-    def end_battle(self, battle_id: str) -> Optional[BattleTeam]:
+    def end_battle(self, battle_id: int) -> Optional[BattleTeam]:
         """结束指定的战斗，返回获胜队伍
         
         Args:
@@ -167,12 +187,16 @@ class BattleService:
         return winning_team
     
     def get_available_characters(self) -> List[Dict[str, Any]]:
-        """获取可用于战斗的角色列表
+        """获取可用于战斗的角色列表，角色仓库未变化时返回缓存，调用方不应修改返回的列表
         
         Returns:
             可用角色的简化信息列表
         """
-        characters = self.character_repository.get_all()
+        # 只遍历一次，无需复制实体列表；先取得实体以确保仓库已加载，再读取版本号
+        characters = self.character_repository.iter_all()
+        version = self.character_repository.version
+        if self._available_cache is not None and version == self._available_version:
+            return self._available_cache
         
         # 转换为简化的字典形式
         result = []
@@ -191,6 +215,8 @@ class BattleService:
                 "skills": [{"name": skill.name, "description": skill.description} for skill in character.skills]
             })
             
+        self._available_cache = result
+        self._available_version = version
         return result
     
     def create_characters_from_indices(self, character_indices: List[int], make_player_controlled: bool = False) -> List[Character]:
@@ -208,7 +234,7 @@ class BattleService:
         
         for idx in character_indices:
             if 0 <= idx < len(all_characters):
-                # 创建角色的深拷贝
+                # 按槽位复制出独立的角色，列表字段各自复制，技能等元素对象与原型共享
                 character = all_characters[idx].clone()
                 if make_player_controlled:
                     character.is_player_controlled = True
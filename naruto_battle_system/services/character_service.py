@@ -53,7 +53,7 @@ class CharacterService:
             for skill_data in character_data["skills"]:
                 skill = self._create_skill(skill_data)
                 if skill:
-                    character.skills.append(skill)
+                    character.add_skill(skill)
         
         # 添加角色特性
         if "traits" in character_data and isinstance(character_data["traits"], list):
@@ -7,7 +7,8 @@ from ..models.battle_state import BattleState
 from ..models.battle_team import BattleTeam
 from ..models.action import Action, ActionResult
 from ..models.skill import Skill, DamageEffect
-from ..models.enums import ActionType, SkillType, TargetType
+from ..models.status_effect import StatusEffect
+from ..models.enums import ActionType, SkillType, TargetType, StatusEffectType
 from ..controllers.battle_controller import BattleController
 
 
@@ -154,6 +155,35 @@ class TestBattleController(unittest.TestCase):
         winning_team = self.battle_controller.get_winning_team()
         self.assertEqual(winning_team, self.team_a)
     
+    def test_alive_characters(self):
+        """测试队伍存活角色列表随阵亡/复活更新"""
+        self.assertEqual(self.team_b.alive_characters, [self.character2])
+        
+        # 受到致命伤害后从存活列表中移除
+        self.character2.take_damage(self.character2.max_hp * 10)
+        self.assertEqual(self.team_b.alive_characters, [])
+        self.assertEqual(self.team_b.alive_count, 0)
+        self.assertTrue(self.battle_controller.is_battle_over())
+        
+        # 复活后重新加入存活列表
+        self.character2.is_alive = True
+        self.assertEqual(self.team_b.alive_characters, [self.character2])
+        self.assertFalse(self.battle_controller.is_battle_over())
+    
+    def test_new_round_skips_characters_killed_mid_round(self):
+        """测试回合开始结算期间阵亡的角色不再回复查克拉"""
+        self.character2.chakra = 0
+        
+        def kill_other(character):
+            if character is self.character1:
+                self.character2.take_damage(self.character2.max_hp)
+        
+        with patch.object(self.battle_controller, '_process_turn_based_effects', side_effect=kill_other):
+            self.battle_controller._prepare_new_round()
+        
+        self.assertFalse(self.character2.is_alive)
+        self.assertEqual(self.character2.chakra, 0)
+    
     def test_next_turn(self):
         """测试下一个回合"""
         # 设置初始回合
@@ -182,6 +212,51 @@ class TestBattleController(unittest.TestCase):
             
             # 验证回合处理后事件被调用
             self.mock_events.on_action_executed.assert_called()
+    
+    def test_action_result_messages(self):
+        """测试行动结果消息的初始化、追加与延迟格式化"""
+        action = Action(self.character1, ActionType.PASS, None, None)
+        result = ActionResult(action, messages=["初始消息"])
+        result.add_message("{}造成了{}点伤害", "测试角色1", 30)
+        result.messages.append("直接追加的消息")
+        self.assertEqual(result.messages, ["初始消息", "测试角色1造成了30点伤害", "直接追加的消息"])
+        
+        # 关闭消息记录时add_message不记录
+        quiet = ActionResult(action, record_messages=False)
+        quiet.add_message("不会记录")
+        self.assertEqual(quiet.messages, [])
+    
+    def test_battle_state_json_cache(self):
+        """测试存活角色列表原地修改后战斗状态重新序列化"""
+        self.battle_state.alive_characters_team1 = ["a", "b"]
+        first = self.battle_state.to_json_bytes()
+        self.assertIs(self.battle_state.to_json_bytes(), first)
+        
+        self.battle_state.alive_characters_team1.remove("b")
+        self.assertIn(b'"alive_characters_team1":["a"]', self.battle_state.to_json_bytes())
+    
+    def test_process_turn_based_effects(self):
+        """测试回合制状态效果的结算与过期移除"""
+        stun = StatusEffect(name="眩晕", description="无法行动", effect_type=StatusEffectType.STUN,
+                            value=0, duration=1)
+        dot = StatusEffect(name="灼烧", description="持续伤害", effect_type=StatusEffectType.DOT,
+                           value=10, duration=2)
+        self.character2.add_status_effect(stun)
+        self.character2.add_status_effect(dot)
+        self.assertTrue(self.character2.is_disabled())
+        
+        # 移除通知发出时过期效果应已从角色身上移除
+        removed_while_present = []
+        self.mock_events.on_status_effect_removed.side_effect = (
+            lambda character, effect: removed_while_present.append(effect in character.status_effects))
+        
+        self.battle_controller._process_turn_based_effects(self.character2)
+        
+        self.assertEqual(self.character2.hp, 90)
+        self.assertEqual(self.character2.status_effects, [dot])
+        self.assertFalse(self.character2.is_disabled())
+        self.mock_events.on_status_effect_removed.assert_called_once_with(self.character2, stun)
+        self.assertEqual(removed_while_present, [False])
 
 
 if __name__ == '__main__':
@@ -2,7 +2,7 @@ import unittest
 from ..models.character import Character
 from ..models.skill import Skill, DamageEffect, HealingEffect
 from ..models.status_effect import StatusEffect
-from ..models.enums import SkillType, TargetType, StatusEffectType
+from ..models.enums import SkillType, TargetType, StatusEffectType, ChaseState
 
 
 class TestCharacter(unittest.TestCase):
@@ -68,7 +68,20 @@ class TestCharacter(unittest.TestCase):
         self.assertEqual(len(self.character.skills), 2)
         self.assertEqual(self.character.skills[0].name, "伤害技能")
         self.assertEqual(self.character.skills[1].name, "治疗技能")
-    
+
+    def test_skill_index(self):
+        """测试技能分类缓存"""
+        # 通过add_skill添加技能
+        self.character.add_skill(self.damage_skill)
+        self.assertEqual(self.character.get_attack_skills(), [self.damage_skill])
+        self.assertEqual(self.character.get_healing_skills(), [])
+
+        # 直接修改技能列表后缓存也应更新
+        self.character.skills.append(self.healing_skill)
+        self.assertEqual(self.character.get_healing_skills(), [self.healing_skill])
+        self.assertEqual(self.character.get_buff_skills(), [])
+        self.assertEqual(self.character.get_aoe_skills(), [])
+
     def test_add_status_effect(self):
         """测试添加状态效果"""
         # 创建状态效果
@@ -99,6 +112,69 @@ class TestCharacter(unittest.TestCase):
         self.assertEqual(self.character.status_effects[0].effect_type, StatusEffectType.BUFF_ATK)
         self.assertEqual(self.character.status_effects[1].effect_type, StatusEffectType.DEBUFF_DEF)
     
+    def test_disable_count(self):
+        """测试无法行动状态计数"""
+        stun = StatusEffect(
+            name="眩晕",
+            description="无法行动",
+            effect_type=StatusEffectType.STUN,
+            value=0,
+            duration=1,
+            source_character_id=None
+        )
+        
+        # 添加眩晕后计数增加，移除后恢复
+        self.character.add_status_effect(stun)
+        self.assertEqual(self.character._disable_count, 1)
+        self.character.remove_status_effect(stun)
+        self.assertEqual(self.character._disable_count, 0)
+        self.assertEqual(len(self.character.status_effects), 0)
+        
+        # 直接修改状态效果列表时也能识别无法行动状态
+        self.character.status_effects.append(stun)
+        self.assertTrue(self.character.is_disabled())
+        self.character.status_effects.clear()
+        self.assertFalse(self.character.is_disabled())
+    
+    def test_chase_states(self):
+        """测试追打状态位掩码"""
+        # NONE不会被记录
+        self.character.add_chase_state(ChaseState.NONE)
+        self.character.add_chase_state(ChaseState.KNOCKDOWN)
+        self.assertTrue(self.character.is_affected_by_chase_state(ChaseState.KNOCKDOWN))
+        self.assertFalse(self.character.is_affected_by_chase_state(ChaseState.NONE))
+        self.assertEqual(self.character.current_states, {ChaseState.KNOCKDOWN})
+        
+        # 移除未处于的状态不影响已有状态
+        self.character.remove_chase_state(ChaseState.REPEL)
+        self.assertTrue(self.character.is_affected_by_chase_state(ChaseState.KNOCKDOWN))
+        
+        self.character.clear_chase_states()
+        self.assertEqual(self.character.current_states, set())
+    
+    def test_status_line(self):
+        """测试状态显示行缓存"""
+        line = self.character.status_line()
+        self.assertIn("HP: 100/100", line)
+        # 未变化时返回同一缓存
+        self.assertIs(self.character.status_line(), line)
+        
+        # 生命值变化后重新格式化
+        self.character.hp = 80
+        self.assertIn("HP: 80/100", self.character.status_line())
+        
+        # 添加状态效果后显示状态
+        stun = StatusEffect(
+            name="眩晕",
+            description="无法行动",
+            effect_type=StatusEffectType.STUN,
+            value=0,
+            duration=1,
+            source_character_id=None
+        )
+        self.character.add_status_effect(stun)
+        self.assertIn("STUN(1回合)", self.character.status_line())
+    
     def test_take_damage(self):
         """测试受到伤害"""
         # 初始HP
@@ -117,6 +193,26 @@ class TestCharacter(unittest.TestCase):
         # 检查角色是否阵亡
         self.assertEqual(self.character.hp, 0)
     
+    def test_take_damage_and_heal_methods(self):
+        """测试受伤与治疗方法的边界"""
+        # 普通伤害返回实际伤害值
+        self.assertEqual(self.character.take_damage(30), 30)
+        self.assertEqual(self.character.hp, 70)
+        
+        # 治疗不超过最大生命值
+        self.assertEqual(self.character.heal(50), 30)
+        self.assertEqual(self.character.hp, 100)
+        
+        # 过量伤害只计算剩余生命值，并使角色阵亡
+        self.assertEqual(self.character.take_damage(150), 100)
+        self.assertEqual(self.character.hp, 0)
+        self.assertFalse(self.character.is_alive)
+        
+        # 阵亡后不再受伤或被治疗
+        self.assertEqual(self.character.take_damage(10), 0)
+        self.assertEqual(self.character.heal(10), 0)
+        self.assertEqual(self.character.hp, 0)
+    
     def test_heal(self):
         """测试治疗"""
         # 先造成一些伤害
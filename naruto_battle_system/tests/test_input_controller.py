@@ -0,0 +1,53 @@
+import unittest
+
+from ..models.character import Character
+from ..models.battle_state import BattleState
+from ..models.battle_team import BattleTeam
+from ..models.enums import ActionType
+from ..controllers.input_controller import InputController, _parse_1based_index
+
+
+class TestInputController(unittest.TestCase):
+    """测试输入控制器"""
+    
+    def setUp(self):
+        """设置测试环境"""
+        self.player = Character(name="玩家角色", id="player", max_hp=100, attack=30)
+        self.enemy = Character(name="敌方角色", id="enemy", max_hp=100, attack=20)
+        team_a = BattleTeam(name="队伍A", player_id="player1", characters=[self.player])
+        team_b = BattleTeam(name="队伍B", player_id="player2", characters=[self.enemy])
+        self.input_controller = InputController(BattleState(team_a, team_b))
+        
+        # 记录回调收到的动作
+        self.actions = []
+        self.input_controller.register_action_callback(self.actions.append)
+    
+    def test_actions_not_reused(self):
+        """测试相同命令每次生成新的动作对象"""
+        self.assertTrue(self.input_controller.process_command("attack 1", self.player))
+        self.assertTrue(self.input_controller.process_command("attack 1", self.player))
+        self.assertTrue(self.input_controller.process_command("pass", self.player))
+        self.assertTrue(self.input_controller.process_command("pass", self.player))
+        
+        self.assertEqual([action.action_type for action in self.actions],
+                         [ActionType.ATTACK, ActionType.ATTACK, ActionType.PASS, ActionType.PASS])
+        self.assertIs(self.actions[0].target, self.enemy)
+        self.assertIsNot(self.actions[0], self.actions[1])
+        self.assertIsNot(self.actions[2], self.actions[3])
+    
+    def test_parse_index(self):
+        """测试解析玩家输入的序号"""
+        self.assertEqual(_parse_1based_index("2", 3), 1)
+        # 全角数字与半角数字等效
+        self.assertEqual(_parse_1based_index("１", 3), 0)
+        self.assertEqual(_parse_1based_index("３", 3), 2)
+        # 无效输入和越界序号
+        for text in ("0", "4", "-1", "a", "²", ""):
+            self.assertEqual(_parse_1based_index(text, 3), -1)
+        
+        self.assertTrue(self.input_controller.process_command("attack １", self.player))
+        self.assertIs(self.actions[-1].target, self.enemy)
+
+
+if __name__ == '__main__':
+    unittest.main()
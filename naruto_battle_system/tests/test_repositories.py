@@ -0,0 +1,150 @@
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from ..models.character import Character
+from ..data import repositories
+from ..data.repositories import BundleRepository, CharacterRepository, JsonRepository, _writer, _CACHE_SCHEMA
+
+
+class TestCharacterRepository(unittest.TestCase):
+    """测试角色存储库的保存与加载"""
+    
+    def setUp(self):
+        """设置测试环境"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_file = os.path.join(self.temp_dir, 'characters.json')
+        self.character = Character(
+            name="测试角色",
+            id="test_character",
+            max_hp=120,
+            attack=30,
+            defense=20,
+            speed=40,
+            tags=["木叶"]
+        )
+    
+    def tearDown(self):
+        """清理测试环境"""
+        _writer.drain()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _save_character(self) -> None:
+        """通过存储库保存测试角色并等待写入完成"""
+        repository = CharacterRepository(self.data_file)
+        repository.add(self.character)
+        repository.flush()
+        _writer.drain()
+    
+    def test_deferred_writes(self):
+        """测试修改只在flush时写入文件"""
+        repository = CharacterRepository(self.data_file)
+        repository.add(self.character)
+        repository.update(self.character)
+        _writer.drain()
+        self.assertFalse(os.path.exists(self.data_file))
+        
+        repository.flush()
+        _writer.drain()
+        self.assertEqual(CharacterRepository(self.data_file).get_all(), [self.character])
+    
+    def test_save_and_reload(self):
+        """测试批量修改后写入文件并重新加载"""
+        repository = CharacterRepository(self.data_file)
+        with repository.batch():
+            repository.add(self.character)
+            # 批量修改期间不写入文件
+            self.assertFalse(os.path.exists(self.data_file))
+        _writer.drain()
+        
+        reloaded = CharacterRepository(self.data_file)
+        self.assertEqual(reloaded.get_all(), [self.character])
+    
+    def test_load_waits_for_pending_writes(self):
+        """测试加载数据前等待后台线程写完"""
+        write_file = repositories._write_file_atomic
+        
+        def slow_write(path, payload, durable):
+            time.sleep(0.1)
+            write_file(path, payload, durable)
+        
+        with patch.object(repositories, '_write_file_atomic', side_effect=slow_write):
+            repository = CharacterRepository(self.data_file)
+            repository.add(self.character)
+            repository.flush()
+            # 不显式等待，加载时应自行等待写入完成
+            reloaded = CharacterRepository(self.data_file)
+            self.assertEqual(reloaded.get_all(), [self.character])
+    
+    def test_coalesce_pending_snapshots(self):
+        """测试同一文件尚未写入的多个快照只写入最后一个"""
+        write_file = repositories._write_file_atomic
+        blocker_file = os.path.join(self.temp_dir, 'blocker.json')
+        gate = threading.Event()
+        written = []
+        
+        def gated_write(path, payload, durable):
+            written.append(path)
+            if path == blocker_file:
+                gate.wait(5)
+            write_file(path, payload, durable)
+        
+        with patch.object(repositories, '_write_file_atomic', side_effect=gated_write):
+            # 后台线程阻塞在第一个文件上时，连续提交同一文件的多个快照
+            _writer.submit(blocker_file, b'[]', False)
+            for index in range(3):
+                _writer.submit(self.data_file, b'[%d]' % index, False)
+            gate.set()
+            _writer.drain()
+        
+        self.assertEqual(written.count(self.data_file), 1)
+        with open(self.data_file, 'rb') as f:
+            self.assertEqual(f.read(), b'[2]')
+    
+    def test_cache_hit(self):
+        """测试数据文件未变化时从缓存文件加载等价的实体"""
+        self._save_character()
+        # 首次加载时生成缓存文件
+        CharacterRepository(self.data_file).get_all()
+        self.assertTrue(os.path.exists(self.data_file + '.pkl'))
+        
+        # 命中缓存时不再解析数据文件
+        with patch.object(JsonRepository, '_load_items', side_effect=AssertionError("未命中缓存")):
+            cached = CharacterRepository(self.data_file).get_all()
+        self.assertEqual(cached, [self.character])
+        self.assertEqual(cached[0].tags, ["木叶"])
+    
+    def test_stale_cache_schema(self):
+        """测试模型结构不一致的缓存文件被忽略"""
+        self._save_character()
+        stat = os.stat(self.data_file)
+        
+        # 写入文件时间与大小匹配、但模型结构标记不同的缓存文件（模拟模型新增字段）
+        stale_schema = _CACHE_SCHEMA + (('Extra', ('field',)),)
+        with open(self.data_file + '.pkl', 'wb') as f:
+            pickle.dump((stale_schema, stat.st_mtime_ns, stat.st_size), f)
+            pickle.dump({"stale": "旧缓存"}, f)
+        
+        repository = CharacterRepository(self.data_file)
+        self.assertEqual(repository.get_all(), [self.character])
+    
+    def test_bundle_reload_keeps_other_sections(self):
+        """测试合并存储库中一个部分重新加载时不丢弃其他部分未保存的修改"""
+        bundle_file = os.path.join(self.temp_dir, 'game.bundle')
+        with open(bundle_file, 'wb') as f:
+            f.write(b'{"characters": [], "skills": [], "status_effects": []}')
+        bundle = BundleRepository(bundle_file)
+        bundle.characters.add(self.character)
+        
+        bundle.skills.load_data()
+        self.assertEqual(bundle.characters.get_all(), [self.character])
+        bundle.characters.flush()
+
+
+if __name__ == '__main__':
+    unittest.main()
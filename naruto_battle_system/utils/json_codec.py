@@ -0,0 +1,47 @@
+"""
+JSON编解码工具
+优先使用C实现的orjson，未安装时回退到标准库json
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(raw: bytes) -> Any:
+    """
+    解析JSON字节串
+    
+    Args:
+        raw: UTF-8编码的JSON内容
+        
+    Returns:
+        解析后的数据
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def json_dumps(data: Any, indent: bool = True) -> bytes:
+    """
+    将数据序列化为UTF-8 JSON字节串
+    
+    Args:
+        data: 要序列化的数据
+        indent: 是否使用两空格缩进，为False时输出紧凑格式
+        
+    Returns:
+        序列化后的字节串
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
@@ -60,45 +60,61 @@ class GameLogger:
         self.log_file = log_file
         self._initialized = True
     
-    def debug(self, message: str) -> None:
+    def isEnabledFor(self, level: int) -> bool:
+        """检查指定级别的日志是否会被记录
+        
+        Args:
+            level: 日志级别
+            
+        Returns:
+            该级别启用时为True，可用于跳过代价较高的日志参数计算
+        """
+        return self.logger.isEnabledFor(level)
+    
+    def debug(self, message: str, *args) -> None:
         """记录调试级别日志
         
         Args:
-            message: 日志消息
+            message: 日志消息，可包含%格式占位符
+            args: 格式化参数，仅在该级别启用时才格式化
         """
-        self.logger.debug(message)
+        self.logger.debug(message, *args)
     
-    def info(self, message: str) -> None:
+    def info(self, message: str, *args) -> None:
         """记录信息级别日志
         
         Args:
-            message: 日志消息
+            message: 日志消息，可包含%格式占位符
+            args: 格式化参数，仅在该级别启用时才格式化
         """
-        self.logger.info(message)
+        self.logger.info(message, *args)
     
-    def warning(self, message: str) -> None:
+    def warning(self, message: str, *args) -> None:
         """记录警告级别日志
         
         Args:
-            message: 日志消息
+            message: 日志消息，可包含%格式占位符
+            args: 格式化参数，仅在该级别启用时才格式化
         """
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
     
-    def error(self, message: str) -> None:
+    def error(self, message: str, *args) -> None:
         """记录错误级别日志
         
         Args:
-            message: 日志消息
+            message: 日志消息，可包含%格式占位符
+            args: 格式化参数，仅在该级别启用时才格式化
         """
-        self.logger.error(message)
+        self.logger.error(message, *args)
     
-    def critical(self, message: str) -> None:
+    def critical(self, message: str, *args) -> None:
         """记录严重错误级别日志
         
         Args:
-            message: 日志消息
+            message: 日志消息，可包含%格式占位符
+            args: 格式化参数，仅在该级别启用时才格式化
         """
-        self.logger.critical(message)
+        self.logger.critical(message, *args)
     
     def log_battle_action(self, character_name: str, action_type: str, target_name: str = None, details: str = None) -> None:
         """记录战斗动作
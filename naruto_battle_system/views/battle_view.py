@@ -308,37 +308,4 @@ class BattleView(IBattleEvents):
             character: 当前行动的角色
         """
         print(f"\n{ConsoleColors.CYAN}请为 {character.name} 选择动作 (输入 'help' 查看命令){ConsoleColors.RESET}")
-        print("> ", end="", flush=True) 
-        
-    def subscribe_damage_event(self, callback: Callable[[Dict[str, Any]], None]) -> None:
-        """订阅伤害事件
-        
-        Args:
-            callback: 事件回调函数
-        """
-        
-        pass
-    
-    def subscribe_status_change_event(self, callback: Callable[[Dict[str, Any]], None]) -> None:
-        """订阅状态变化事件
-        
-        Args:
-            callback: 事件回调函数
-        """
-        pass
-    
-    def subscribe_turn_change_event(self, callback: Callable[[Dict[str, Any]], None]) -> None:
-        """订阅回合变化事件
-        
-        Args:
-            callback: 事件回调函数
-        """
-        pass
-    
-    def subscribe_chase_trigger_event(self, callback: Callable[[Dict[str, Any]], None]) -> None:
-        """订阅追打触发事件
-        
-        Args:
-            callback: 事件回调函数
-        """
-        pass
\ No newline at end of file
+        print("> ", end="", flush=True) 
\ No newline at end of file
@@ -1,7 +1,29 @@
 import os
+import sys
 from typing import List, Dict, Callable, Any, Optional
 
 
+# 帮助信息在模块加载时拼好，显示时一次写出
+_HELP_TEXT = """
+===== 帮助信息 =====
+
+战斗系统说明:
+1. 回合制战斗 - 每个角色按照速度顺序依次行动
+2. 技能系统 - 使用查克拉施放忍术，每回合开始会恢复部分查克拉
+3. 状态效果 - 角色可以受到各种状态效果的影响，如中毒、灼烧等
+4. 连击系统 - 有一定几率触发连击，进行额外的攻击
+
+战斗指令:
+- attack/a [目标ID] - 对指定目标进行普通攻击
+- skill/s [技能ID] [目标ID] - 使用指定技能攻击指定目标
+- item/i [道具ID] [目标ID] - 使用指定道具（尚未实现）
+- pass/p - 跳过当前回合
+- status/st - 显示战斗状态
+- help/h - 显示帮助信息
+
+按Enter键返回主菜单...
+"""
+
 class MenuView:
     """菜单视图，用于显示游戏菜单和处理菜单选择"""
     
@@ -173,23 +195,7 @@ class MenuView:
     def show_help(self) -> None:
         """显示帮助信息"""
         self.clear_screen()
-        print("\n===== 帮助信息 =====\n")
-        
-        print("战斗系统说明:")
-        print("1. 回合制战斗 - 每个角色按照速度顺序依次行动")
-        print("2. 技能系统 - 使用查克拉施放忍术，每回合开始会恢复部分查克拉")
-        print("3. 状态效果 - 角色可以受到各种状态效果的影响，如中毒、灼烧等")
-        print("4. 连击系统 - 有一定几率触发连击，进行额外的攻击")
-        
-        print("\n战斗指令:")
-        print("- attack/a [目标ID] - 对指定目标进行普通攻击")
-        print("- skill/s [技能ID] [目标ID] - 使用指定技能攻击指定目标")
-        print("- item/i [道具ID] [目标ID] - 使用指定道具（尚未实现）")
-        print("- pass/p - 跳过当前回合")
-        print("- status/st - 显示战斗状态")
-        print("- help/h - 显示帮助信息")
-        
-        print("\n按Enter键返回主菜单...")
+        sys.stdout.write(_HELP_TEXT)
         input()
     
     def show_exit_confirmation(self) -> bool: